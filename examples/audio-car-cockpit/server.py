@@ -1,6 +1,8 @@
+import asyncio
 import base64
+import re
 import webbrowser
-from contextlib import asynccontextmanager
+from contextlib import aclosing, asynccontextmanager, suppress
 from pathlib import Path
 
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
@@ -10,7 +12,7 @@ from openai import AsyncOpenAI
 from src.checklist import create_checklist_router
 from src.connection_manager import ConnectionManager
 from src.functions import create_functions_router
-from src.llamacpp_inference import ToolCallingRuntime, function_to_args, spawn_server
+from src.llamacpp_inference import SLOT_SAVE_PATH, ToolCallingRuntime, function_to_args, spawn_server
 from src.settings import p_env
 
 
@@ -19,15 +21,22 @@ async def lifespan(app: FastAPI):
     print("Setting up...")
 
     # Prepare inference runtimes
+    tool_model = "LiquidAI/LFM2-1.2B-Tool-GGUF:Q8_0"
     with (
-        spawn_server(file_name="LiquidAI/LFM2-1.2B-Tool-GGUF:Q8_0") as (_, port_lm),
+        spawn_server(file_name=tool_model, slot_save_path=SLOT_SAVE_PATH, parallel=p_env.TOOL_SLOTS) as (_, port_lm),
     ):
-        app.state.tcr = ToolCallingRuntime(port=port_lm)
+        app.state.tcr = ToolCallingRuntime(
+            port=port_lm, model=tool_model, n_slots=p_env.TOOL_SLOTS, tool_top_k=p_env.TOOL_TOP_K
+        )
+        try:
+            await app.state.tcr.warm_up()
 
-        _url = p_env.DEMO_URL.unicode_string()
-        print(f"Ready, opening: {_url}")
-        webbrowser.open(_url, new=0, autoraise=True)
-        yield
+            _url = p_env.DEMO_URL.unicode_string()
+            print(f"Ready, opening: {_url}")
+            webbrowser.open(_url, new=0, autoraise=True)
+            yield
+        finally:
+            await app.state.tcr.aclose()
 
 
 # Initialize FastAPI app and connection manager
@@ -71,7 +80,7 @@ async def get_index():
 async def tool_calling_single_turn(query: str):
     tcr: ToolCallingRuntime = app.state.tcr
 
-    tool_call, text = tcr.completion(query)
+    tool_call, text = await tcr.completion(query)
 
     if tool_call is not None:
         func_name, args = function_to_args(tool_call)
@@ -86,6 +95,13 @@ async def tool_calling_single_turn(query: str):
     return JSONResponse(content={"tool_call": tool_call, "text": text})
 
 
+@app.get("/debug/prompt-cache")
+async def debug_prompt_cache():
+    """Prompt tokens the tool calling model evaluated versus reused from its KV cache."""
+    tcr: ToolCallingRuntime = app.state.tcr
+    return JSONResponse(content=tcr.prompt_cache_stats.as_dict())
+
+
 # Include routers
 app.include_router(create_functions_router(manager))
 app.include_router(create_checklist_router(manager))
@@ -111,9 +127,11 @@ async def websocket_audio_endpoint(websocket: WebSocket):
 
     voice = "US female"
 
-    try:
+    async def process_requests(requests: asyncio.Queue[dict]):
+        nonlocal voice
+
         while True:
-            data = await websocket.receive_json()
+            data = await requests.get()
             mode = data.get("mode", "asr")
             text = data.get("text")
             audio_b64 = data.get("audio")
@@ -181,83 +199,167 @@ async def websocket_audio_endpoint(websocket: WebSocket):
                 # Send User caption
                 await websocket.send_json({"type": "caption", "role": "driver", "text": transcribed_text})
 
-                # Process through tool calling runtime
-                print("[AUDIO] Processing through tool calling model...")
-                tcr: ToolCallingRuntime = app.state.tcr
-                tool_call, response_text = tcr.completion(transcribed_text)
-
-                formatted_tool_name = None
-                tool_call_valid = True
-
-                # Execute function call if present
-                if tool_call is not None:
-                    print(f"[AUDIO] Tool call detected: {tool_call}")
-                    formatted_tool_name = tool_call
-                    try:
-                        func_name, args = function_to_args(tool_call)
-                        formatted_tool_name = func_name
-
-                        if not manager.active_connections:
-                            print("[AUDIO] No active cockpit connections")
-                            response_text = "Sorry, the cockpit is not connected."
-                        else:
-                            ws = manager.active_connections[0]
-                            result = await manager.send_rpc_request(ws, func_name, args)
-                            if result is not None:
-                                tool_call_valid = result
-                            print(f"[AUDIO] Function call result: {result}")
-                    except Exception as e:
-                        print(f"[AUDIO] Function call error: {e}")
-                        # Override response with error message
-                        response_text = f"Sorry, the model called the non-existing function: {tool_call}"
-                        tool_call_valid = False
-                else:
-                    print("[AUDIO] No tool call detected")
-
-                # Send caption
-                await websocket.send_json(
-                    {
-                        "type": "caption",
-                        "role": "model",
-                        "text": response_text,
-                        "tool": formatted_tool_name,
-                        "tool_valid": tool_call_valid,
-                    }
-                )
-
-                # Send the response text to TTS
                 voice = data.get("voice", None) or voice
-                print(f"[AUDIO] Sending to TTS with voice '{voice}': '{response_text}'")
-                tts_messages = [
-                    {
-                        "role": "system",
-                        "content": f"Perform TTS. Use the {voice} voice.",
-                    },
-                    {"role": "user", "content": response_text},
-                ]
-
-                tts_stream = await audio_client.chat.completions.create(
-                    model="",
-                    messages=tts_messages,
-                    stream=True,
-                    max_tokens=512,
-                )
-
-                async for chunk in tts_stream:
-                    delta = chunk.choices[0].delta
-
-                    if hasattr(delta, "audio_chunk") and delta.audio_chunk:
-                        chunk_data = delta.audio_chunk["data"]
-                        # Send audio chunk immediately for low latency
-                        await websocket.send_json({"type": "audio", "data": chunk_data, "sample_rate": 24000})
+                await respond_to_command(websocket, audio_client, transcribed_text, voice)
 
             await websocket.send_json({"type": "done"})
 
+    # Requests are processed in order on their own task, so that a disconnect is noticed while one is still running
+    # and cancels it, along with its in-flight tool calling and audio requests.
+    requests: asyncio.Queue[dict] = asyncio.Queue()
+    processing = asyncio.create_task(process_requests(requests))
+    receiving = asyncio.create_task(_receive_json_into(websocket, requests))
+    try:
+        done, _ = await asyncio.wait({processing, receiving}, return_when=asyncio.FIRST_COMPLETED)
+        # Surface processing errors; the receiver only ends on disconnect
+        if processing in done:
+            processing.result()
     except WebSocketDisconnect:
         pass
     except Exception as e:
         print(f"[AUDIO] Error: {e}")
-        await websocket.send_json({"type": "error", "data": str(e)})
+        with suppress(Exception):
+            await websocket.send_json({"type": "error", "data": str(e)})
+    finally:
+        for task in (processing, receiving):
+            task.cancel()
+        await asyncio.gather(processing, receiving, return_exceptions=True)
+        await audio_client.close()
+
+
+# Sentence boundaries at which the model's reply is handed to TTS
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+async def respond_to_command(websocket: WebSocket, audio_client: AsyncOpenAI, command: str, voice: str):
+    """Run the tool calling model on a voice command, execute its tool call, and speak its reply.
+
+    The stages overlap: the cockpit RPC starts as soon as the tool call is generated, and each sentence of the reply
+    is sent to TTS as soon as it is complete, while the rest is still being generated.
+    """
+    print("[AUDIO] Processing through tool calling model...")
+    tcr: ToolCallingRuntime = app.state.tcr
+
+    sentences: asyncio.Queue[str | None] = asyncio.Queue()
+    speaking = asyncio.create_task(_speak(websocket, audio_client, voice, sentences))
+    # One task per tool call, in the order the model made them
+    tool_call_tasks: list[asyncio.Task[tuple[str, bool, str | None]]] = []
+    response_text, pending = "", ""
+
+    try:
+        async with aclosing(tcr.stream_tool_call(command)) as events:
+            async for kind, value in events:
+                if kind == "tool_call":
+                    print(f"[AUDIO] Tool call detected: {value}")
+                    tool_call_tasks.append(asyncio.create_task(_execute_tool_call(value)))
+                    continue
+
+                # The reply would be replaced anyway, stop generating it
+                if any(task.done() and task.result()[2] is not None for task in tool_call_tasks):
+                    pending = ""
+                    break
+
+                response_text += value
+                *complete, pending = _SENTENCE_END.split(pending + value)
+                for sentence in complete:
+                    sentences.put_nowait(sentence)
+        if pending.strip():
+            sentences.put_nowait(pending)
+
+        formatted_tool_name = None
+        tool_call_valid = True
+        if not tool_call_tasks:
+            print("[AUDIO] No tool call detected")
+        else:
+            results = await asyncio.gather(*tool_call_tasks)
+            formatted_tool_name = ", ".join(name for name, _, _ in results)
+            tool_call_valid = all(valid for _, valid, _ in results)
+            error_text = next((error for _, _, error in results if error is not None), None)
+            if error_text is not None:
+                # Replace what has not been spoken yet with the error
+                while not sentences.empty():
+                    sentences.get_nowait()
+                sentences.put_nowait(error_text)
+                response_text = error_text
+
+        # Send caption
+        await websocket.send_json(
+            {
+                "type": "caption",
+                "role": "model",
+                "text": response_text.strip(),
+                "tool": formatted_tool_name,
+                "tool_valid": tool_call_valid,
+            }
+        )
+
+        sentences.put_nowait(None)
+        await speaking
+    finally:
+        tasks = [speaking, *tool_call_tasks]
+        for task in tasks:
+            task.cancel()
+        # Wait until every task has stopped; `_execute_tool_call` returns its errors rather than raising them
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def _execute_tool_call(tool_call: str) -> tuple[str, bool, str | None]:
+    """Send a tool call to the cockpit.
+
+    Returns:
+        The function name to display, whether the call succeeded, and the message replacing the model's reply if
+        the call could not be made
+    """
+    try:
+        func_name, args = function_to_args(tool_call)
+
+        if not manager.active_connections:
+            print("[AUDIO] No active cockpit connections")
+            return func_name, True, "Sorry, the cockpit is not connected."
+
+        ws = manager.active_connections[0]
+        result = await manager.send_rpc_request(ws, func_name, args)
+        print(f"[AUDIO] Function call result: {result}")
+        return func_name, result if result is not None else True, None
+    except Exception as e:
+        print(f"[AUDIO] Function call error: {e}")
+        return tool_call, False, f"Sorry, the model called the non-existing function: {tool_call}"
+
+
+async def _speak(websocket: WebSocket, audio_client: AsyncOpenAI, voice: str, sentences: asyncio.Queue[str | None]):
+    """Stream TTS audio for each queued sentence, in order, until None is queued."""
+    while (sentence := await sentences.get()) is not None:
+        print(f"[AUDIO] Sending to TTS with voice '{voice}': '{sentence}'")
+        tts_messages = [
+            {
+                "role": "system",
+                "content": f"Perform TTS. Use the {voice} voice.",
+            },
+            {"role": "user", "content": sentence},
+        ]
+
+        tts_stream = await audio_client.chat.completions.create(
+            model="",
+            messages=tts_messages,
+            stream=True,
+            max_tokens=512,
+        )
+
+        async for chunk in tts_stream:
+            delta = chunk.choices[0].delta
+
+            if hasattr(delta, "audio_chunk") and delta.audio_chunk:
+                chunk_data = delta.audio_chunk["data"]
+                # Send audio chunk immediately for low latency
+                await websocket.send_json({"type": "audio", "data": chunk_data, "sample_rate": 24000})
+
+
+async def _receive_json_into(websocket: WebSocket, requests: asyncio.Queue[dict]):
+    try:
+        while True:
+            await requests.put(await websocket.receive_json())
+    except WebSocketDisconnect:
+        print("[AUDIO] Client disconnected")
 
 
 if __name__ == "__main__":
@@ -1,19 +1,24 @@
 import ast
+import hashlib
 import json
 import signal
 import subprocess
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Coroutine, Generator
 from contextlib import contextmanager
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
 from time import sleep
-from typing import AsyncGenerator, overload
+from typing import Any, Literal, overload
 
 import httpx
 from httpx_retries import Retry, RetryTransport
 
+from src.tool_retrieval import ToolRetriever
 from src.utils import find_available_port
 
+# KV cache snapshots written by llama-server's `/slots` endpoint
+SLOT_SAVE_PATH = Path.cwd() / ".cache" / "llama-slots"
+
 
 def _get_func_name(node: ast.expr):
     if isinstance(node, ast.Name):
@@ -56,8 +61,14 @@ def function_to_args(call_str: str) -> tuple[str, dict]:
 
 def spawn_embedding_runtime(
     file_name: str | Path,
+    slot_save_path: Path | None = None,
+    parallel: int = 1,
 ) -> tuple[subprocess.Popen, int]:
-    """Spawns the llama-server process."""
+    """Spawns the llama-server process.
+
+    With `slot_save_path`, slot KV caches can be saved to and restored from that directory. `parallel` slots serve
+    requests concurrently, each with its own context.
+    """
 
     port = find_available_port(preferred_port=8989)
     host = "127.0.0.1"
@@ -74,13 +85,19 @@ def spawn_embedding_runtime(
         "--n-gpu-layers",
         "9999",
         "--mlock",
+        "--parallel",
+        str(parallel),
+        # Context per slot times the number of slots
         "--ctx-size",
-        "2048",
+        str(2048 * parallel),
         # Special tokens output enabled
         "--special",
         "-hf",
         str(file_name),
     ]
+    if slot_save_path is not None:
+        slot_save_path.mkdir(parents=True, exist_ok=True)
+        command += ["--slot-save-path", str(slot_save_path)]
 
     try:
         # Use Popen for non-blocking execution
@@ -126,8 +143,10 @@ def spawn_embedding_runtime(
 @contextmanager
 def spawn_server(
     file_name: str | Path,
-) -> Generator[tuple[subprocess.Popen, int], None, None]:
-    embedding_process, embedding_port = spawn_embedding_runtime(file_name)
+    slot_save_path: Path | None = None,
+    parallel: int = 1,
+) -> Generator[tuple[subprocess.Popen, int]]:
+    embedding_process, embedding_port = spawn_embedding_runtime(file_name, slot_save_path, parallel)
     try:
         yield embedding_process, embedding_port
     finally:
@@ -147,18 +166,171 @@ def spawn_server(
                 embedding_process.wait()
 
 
+class ToolCallStreamParser:
+    """Splits streamed tool model output into its tool call and the message for the user.
+
+    Feed it content deltas as they arrive: the tool call is reported as soon as its end token is generated, and the
+    message is reported in pieces while it is still being generated. The message may come before the tool call,
+    after it, or both.
+    """
+
+    TOOL_CALL_START = "<|tool_call_start|>"
+    TOOL_CALL_END = "<|tool_call_end|>"
+    END_OF_TURN = "<|im_end|>"
+
+    def __init__(self):
+        self._buffer = ""
+        self._state: Literal["start", "tool_call", "text"] = "start"
+
+    def feed(self, delta: str) -> list[tuple[Literal["tool_call", "text"], str]]:
+        self._buffer += delta
+        events = []
+
+        while True:
+            if self._state == "start":
+                stripped = self._buffer.lstrip()
+                if stripped.startswith(self.TOOL_CALL_START):
+                    self._buffer = stripped[len(self.TOOL_CALL_START) :]
+                    self._state = "tool_call"
+                elif self.TOOL_CALL_START.startswith(stripped):
+                    return events  # Could still be the start of a tool call
+                else:
+                    self._state = "text"
+
+            elif self._state == "tool_call":
+                if self.TOOL_CALL_END not in self._buffer:
+                    return events
+                tool_call, self._buffer = self._buffer.split(self.TOOL_CALL_END, maxsplit=1)
+                events.append(("tool_call", tool_call.strip().lstrip("[").rstrip("]")))
+                self._state = "text"
+
+            else:
+                text = self._buffer.replace(self.END_OF_TURN, "")
+                if self.TOOL_CALL_START in text:
+                    # A tool call after some text: report the text, then parse the call
+                    text, self._buffer = text.split(self.TOOL_CALL_START, maxsplit=1)
+                    if text:
+                        events.append(("text", text))
+                    self._state = "tool_call"
+                    continue
+                # Hold back what could be the beginning of a tool call or end of turn token
+                held = max(
+                    self._partial_token_length(text, token) for token in (self.TOOL_CALL_START, self.END_OF_TURN)
+                )
+                self._buffer = text[len(text) - held :]
+                if text := text[: len(text) - held]:
+                    events.append(("text", text))
+                return events
+
+    @staticmethod
+    def _partial_token_length(text: str, token: str) -> int:
+        """Length of the longest end of `text` that is the beginning of `token`."""
+        return next((i for i in range(len(token) - 1, 0, -1) if text.endswith(token[:i])), 0)
+
+    def close(self) -> list[tuple[Literal["tool_call", "text"], str]]:
+        """Report what is left once generation is done."""
+        if self._state == "tool_call":
+            return [("tool_call", self._buffer.strip().lstrip("[").rstrip("]"))]
+        text = self._buffer.replace(self.END_OF_TURN, "")
+        return [("text", text)] if text.strip() else []
+
+
+@dataclass
+class PromptCacheStats:
+    """Prompt tokens llama-server evaluated, versus reused from the slot's KV cache."""
+
+    # Tokens in the shared prompt prefix (system prompt and tool list)
+    prefix_tokens: int = 0
+    # Whether the prefix KV cache was restored from disk at startup
+    restored_from_disk: bool = False
+    requests: int = 0
+    evaluated: int = 0
+    reused: int = 0
+    # Requests whose timings lacked `prompt_n` or `cache_n`, left out of the counts above
+    unreported: int = 0
+    last_evaluated: int | None = None
+    last_reused: int | None = None
+
+    def record(self, response: dict):
+        """Count the tokens of one `/completion` response."""
+        timings: dict = response.get("timings", {})
+        # `tokens_cached` is the size of the whole cache, not the prompt tokens reused, so it is no substitute
+        self.last_evaluated = timings.get("prompt_n")
+        self.last_reused = timings.get("cache_n")
+        self.requests += 1
+        if self.last_evaluated is None or self.last_reused is None:
+            self.unreported += 1
+            return
+        self.evaluated += self.last_evaluated
+        self.reused += self.last_reused
+
+    def reset(self):
+        self.requests = self.evaluated = self.reused = self.unreported = 0
+        self.last_evaluated = self.last_reused = None
+
+    def as_dict(self) -> dict:
+        total = self.evaluated + self.reused
+        return asdict(self) | {"reuse_ratio": round(self.reused / total, 4) if total else None}
+
+
 @dataclass(kw_only=True)
 class ToolCallingRuntime:
+    """Tool calling through llama-server, safe to await from the event loop.
+
+    All requests share one pooled `httpx.AsyncClient`, so connections to llama-server are kept alive between voice
+    commands. Cancelling an awaiting task (e.g. when its websocket disconnects) closes the request, which makes
+    llama-server stop generating for it.
+
+    Every prompt starts with the same long prefix (system prompt and tool list), and completions use `cache_prompt`:
+    only the user message is evaluated, the prefix comes from the slot's KV cache. At warm-up the prefix is
+    evaluated in slot 0, saved to disk, keyed by the prefix and model, and restored into every other slot, so that
+    concurrent commands (e.g. from several `/ws-audio` connections) each run in their own slot with the prefix
+    cached; llama-server picks the idle slot. On the next start the snapshot is restored instead of evaluating the
+    prefix again. `n_slots` must match llama-server's `--parallel`. `prompt_cache_stats` counts evaluated versus
+    reused tokens.
+
+    With `tool_top_k`, only the functions a BM25 search finds most relevant to the query are put in the prompt. This
+    keeps prompts short on large catalogs, at the cost of the shared prefix ending before the tool list.
+
+    Call `warm_up()` once before use and `aclose()` on shutdown.
+    """
+
     port: int
     host: str = "localhost"
     max_tokens: int = 4096
+    # Seconds to connect, and to wait for a full completion
+    connect_timeout: float = 3.0
+    completion_timeout: float = 30.0
+    max_connections: int = 8
+    # Number of llama-server slots (`--parallel`), each given the prompt prefix at warm-up
+    n_slots: int = 1
+    # Model served by llama-server, part of the slot snapshot's cache key
+    model: str = ""
+    # Number of functions to retrieve per query, None to always send the whole catalog
+    tool_top_k: int | None = None
+    prompt_cache_stats: PromptCacheStats = field(default_factory=PromptCacheStats)
 
     def __post_init__(self):
-        self.client = httpx.Client(transport=RetryTransport(retry=Retry(total=3, backoff_factor=0.1)))
+        self.client = httpx.AsyncClient(
+            base_url=f"http://{self.host}:{self.port}",
+            transport=RetryTransport(
+                transport=httpx.AsyncHTTPTransport(
+                    limits=httpx.Limits(
+                        max_connections=self.max_connections,
+                        max_keepalive_connections=self.max_connections,
+                        keepalive_expiry=60.0,
+                    )
+                ),
+                retry=Retry(total=3, backoff_factor=0.1),
+            ),
+            timeout=httpx.Timeout(self.completion_timeout, connect=self.connect_timeout),
+            headers={"Content-Type": "application/json"},
+        )
 
         self.default_completion_params: dict[str, float | int | bool] = {
             "temperature": 0.0,
             "n_predict": 512,
+            "cache_prompt": True,
         }
 
         path_functions_def: Path = Path(__file__).parent.parent / "functions.json"
@@ -173,52 +345,134 @@ class ToolCallingRuntime:
             """If you call a function, also output a brief message for the user. The message should be concise."""
         )
 
-        self.system_prompt = f"""List of tools:
+        self._system_prompt_format = f"""List of tools:
 
-<|tool_list_start|>{self.all_functions_no_indent}<|tool_list_end|>
+<|tool_list_start|>{{tool_list}}<|tool_list_end|>
 
 {_instructions}"""
+        self.system_prompt = self._system_prompt_format.format(tool_list=self.all_functions_no_indent)
+
+        self.retriever: ToolRetriever | None = None
+        if self.tool_top_k is not None and self.tool_top_k < len(self.list_functions):
+            self.retriever = ToolRetriever(self.list_functions)
 
         self._last_messages: list[dict] = []
 
-        # Warmup
+        # Chat prompt as (head, mid, tail) around the tool list and the user message, see `_load_prompt_template`
+        self._prompt_template: tuple[str, str, str] | None = None
+
+    async def warm_up(self):
         print("Inference warming...", end=" ")
-        _ = self.completion("Turn on the audio.")
-        print("Done")
+        self._prompt_template = await self._load_prompt_template()
+        self.prompt_cache_stats.prefix_tokens = await self._count_tokens(self._shared_prefix())
+
+        restored = await self._slot_action("restore", slot_id=0)
+        _ = await self._completion("Turn on the audio.", slot_id=0)
+        if not restored:
+            await self._slot_action("save", slot_id=0)
+        # Without a snapshot on disk, the other slots evaluate the prefix on their first command instead
+        for slot_id in range(1, self.n_slots):
+            await self._slot_action("restore", slot_id=slot_id)
+
+        self.prompt_cache_stats.restored_from_disk = restored
+        self.prompt_cache_stats.reset()
+        print("Done (prefix restored from disk)" if restored else "Done")
 
-    def __del__(self):
-        self.client.close()
+    async def aclose(self):
+        await self.client.aclose()
 
-    def _apply_template(self, content: str) -> str:
-        response = self.client.post(
-            f"http://{self.host}:{self.port}/apply-template",
+    async def _load_prompt_template(self) -> tuple[str, str, str]:
+        """Render the chat template once, around a placeholder tool list and user message.
+
+        Only the tool list and the user message change between queries, so the text around them is kept, and
+        prompts are then built locally.
+        """
+        tool_list, user_message = "<<TOOL_LIST>>", "<<USER_MESSAGE>>"
+        response = await self.client.post(
+            "/apply-template",
             json={
                 "messages": [
-                    {"role": "system", "content": self.system_prompt},
-                    {"role": "user", "content": content},
+                    {"role": "system", "content": self._system_prompt_format.format(tool_list=tool_list)},
+                    {"role": "user", "content": user_message},
                 ]
             },
-            headers={"Content-Type": "application/json"},
-            timeout=3.0,
+            timeout=httpx.Timeout(self.connect_timeout),
         )
         response.raise_for_status()
-        formatted_prompt: str = response.json().get("prompt")
-        return formatted_prompt
-
-    def _completion(self, content: str) -> tuple[str | None, str]:
-        formatted_prompt = self._apply_template(content)
-
-        response = self.client.post(
-            f"http://{self.host}:{self.port}/completion",
-            json=self.default_completion_params
-            | {
-                "prompt": formatted_prompt,
-            },
-            headers={"Content-Type": "application/json"},
-            timeout=30.0,
+        rendered: str = response.json().get("prompt")
+
+        if not rendered or rendered.count(tool_list) != 1 or rendered.count(user_message) != 1:
+            raise RuntimeError(f"Unexpected chat template rendering:\n{rendered}")
+        head, rest = rendered.split(tool_list)
+        mid, tail = rest.split(user_message)
+        return head, mid, tail
+
+    def _shared_prefix(self) -> str:
+        """Prompt text common to every query."""
+        head, mid, _ = self._prompt_template or ("", "", "")
+        if self.retriever is not None:
+            return head
+        return head + self.all_functions_no_indent + mid
+
+    async def _count_tokens(self, text: str) -> int:
+        response = await self.client.post(
+            "/tokenize", json={"content": text}, timeout=httpx.Timeout(self.connect_timeout)
         )
         response.raise_for_status()
+        return len(response.json()["tokens"])
+
+    def _slot_filename(self) -> str:
+        key = hashlib.sha256(f"{self.model}\0{self._shared_prefix()}".encode()).hexdigest()[:16]
+        return f"tool-prefix-{key}.bin"
+
+    async def _slot_action(self, action: str, slot_id: int) -> bool:
+        """Save or restore a slot's KV cache. Returns False if llama-server could not."""
+        try:
+            response = await self.client.post(
+                f"/slots/{slot_id}",
+                params={"action": action},
+                json={"filename": self._slot_filename()},
+            )
+            response.raise_for_status()
+        except httpx.HTTPError:
+            # No snapshot yet, a snapshot from another llama.cpp build, or no `--slot-save-path`
+            return False
+        return True
+
+    def _tool_list(self, content: str) -> str:
+        """Functions to offer for this query, as JSON."""
+        if self.retriever is None:
+            return self.all_functions_no_indent
+
+        functions = self.retriever.search(content, self.tool_top_k)
+        return json.dumps(functions, indent=2, ensure_ascii=False)
+
+    async def _apply_template(self, content: str) -> str:
+        if self._prompt_template is None:
+            self._prompt_template = await self._load_prompt_template()
+        head, mid, tail = self._prompt_template
+        return head + self._tool_list(content) + mid + content + tail
+
+    async def _completion(self, content: str, slot_id: int | None = None) -> tuple[str | None, str]:
+        try:
+            formatted_prompt = await self._apply_template(content)
+
+            response = await self.client.post(
+                "/completion",
+                json=self.default_completion_params
+                | {
+                    "prompt": formatted_prompt,
+                    # None lets llama-server pick an idle slot
+                    "id_slot": -1 if slot_id is None else slot_id,
+                },
+            )
+            response.raise_for_status()
+        except httpx.HTTPStatusError as e:
+            print(f"Failed on:\n{content}\n{e}")
+            raise
+
         j = response.json()
+        self.prompt_cache_stats.record(j)
         rez: str = j.get("content")
 
         # Separate tool call and response
@@ -226,51 +480,74 @@ class ToolCallingRuntime:
             rez = rez.rstrip("<|im_end|>")
             return None, rez
 
-        rez = rez.split("<|tool_call_start|>", maxsplit=1)[1]
+        before, rez = rez.split("<|tool_call_start|>", maxsplit=1)
         tool_call, text = rez.split("<|tool_call_end|>", maxsplit=1)
         tool_call = tool_call.lstrip("[").rstrip("]")
-        text = text.rstrip("<|im_end|>")
+        text = before + text.rstrip("<|im_end|>")
 
         return tool_call, text
 
-    async def _completion_stream(self, content: str) -> AsyncGenerator[str, None]:
+    async def _completion_stream(self, content: str) -> AsyncGenerator[str]:
         """SSE response
 
         https://html.spec.whatwg.org/multipage/server-sent-events.html
         """
 
-        formatted_prompt = self._apply_template(content)
+        formatted_prompt = await self._apply_template(content)
 
-        async with httpx.AsyncClient() as aclient:
-            async with aclient.stream(
-                "post",
-                f"http://{self.host}:{self.port}/completion",
-                json=self.default_completion_params
-                | {
-                    "prompt": formatted_prompt,
-                    "stream": True,
-                },
-                headers={"Content-Type": "application/json"},
-                timeout=30.0,
-            ) as r:
-                async for x in r.aiter_text():
-                    yield x
+        async with self.client.stream(
+            "post",
+            "/completion",
+            json=self.default_completion_params
+            | {
+                "prompt": formatted_prompt,
+                "stream": True,
+            },
+        ) as r:
+            async for x in r.aiter_text():
+                yield x
+
+    async def stream_tool_call(self, content: str) -> AsyncGenerator[tuple[Literal["tool_call", "text"], str]]:
+        """Stream the tool call, as soon as it is complete, then the message for the user as it is generated."""
+        formatted_prompt = await self._apply_template(content)
+        parser = ToolCallStreamParser()
+
+        async with self.client.stream(
+            "post",
+            "/completion",
+            json=self.default_completion_params
+            | {
+                "prompt": formatted_prompt,
+                "stream": True,
+            },
+        ) as r:
+            r.raise_for_status()
+            async for line in r.aiter_lines():
+                if not line.startswith("data: "):
+                    continue
+                chunk = json.loads(line.removeprefix("data: "))
+                for event in parser.feed(chunk.get("content", "")):
+                    yield event
+                if chunk.get("stop"):
+                    self.prompt_cache_stats.record(chunk)
+
+        for event in parser.close():
+            yield event
 
     @overload
     def completion(
         self,
         content: str,
-    ) -> tuple[str | None, str]: ...
+    ) -> Coroutine[Any, Any, tuple[str | None, str]]: ...
 
     @overload
-    def completion(self, content: str, stream: bool = True) -> AsyncGenerator[str, None]: ...
+    def completion(self, content: str, stream: bool = True) -> AsyncGenerator[str]: ...
 
-    def completion(self, content: str, stream: bool = False) -> tuple[str | None, str] | AsyncGenerator[str, None]:
-        try:
-            if stream:
-                return self._completion_stream(content)
-            else:
-                return self._completion(content)
-        except httpx.HTTPStatusError as e:
-            print(f"Failed on:\n{content}\n{e}")
-            raise
+    def completion(
+        self, content: str, stream: bool = False
+    ) -> Coroutine[Any, Any, tuple[str | None, str]] | AsyncGenerator[str]:
+        """Await the result, or iterate over the SSE stream with `stream=True`."""
+        if stream:
+            return self._completion_stream(content)
+        else:
+            return self._completion(content)
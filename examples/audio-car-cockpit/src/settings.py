@@ -7,6 +7,10 @@ class PydanticSettings(BaseSettings, case_sensitive=False):
 
     DEMO_URL: HttpUrl
     AUDIO_SERVER_PORT: int
+    # Functions retrieved per voice command; unset sends the whole catalog
+    TOOL_TOP_K: int | None = None
+    # Voice commands the tool calling model serves concurrently, each in its own llama-server slot
+    TOOL_SLOTS: int = 2
 
 
 p_env = PydanticSettings()  # type:ignore[reportCallIssue]
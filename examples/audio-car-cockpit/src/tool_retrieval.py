@@ -0,0 +1,118 @@
+import math
+import re
+from collections import Counter
+
+# Filler words of voice commands; "on", "off", "up" and "down" carry meaning here and are kept
+_STOPWORDS = frozenset(
+    {
+        "a",
+        "an",
+        "the",
+        "to",
+        "of",
+        "and",
+        "or",
+        "for",
+        "with",
+        "in",
+        "at",
+        "my",
+        "me",
+        "i",
+        "you",
+        "your",
+        "it",
+        "its",
+        "is",
+        "are",
+        "be",
+        "can",
+        "could",
+        "would",
+        "please",
+        "this",
+        "that",
+        "some",
+    }
+)
+
+
+# Suffixes folded so that inflections share a term ("navigate", "navigating", "navigation"), longest first
+_SUFFIXES = ("ions", "ings", "ion", "ing", "ers", "ed", "er", "es", "s", "e")
+
+
+def _stem(word: str) -> str:
+    """Strip one common suffix, keeping at least 3 letters; "warmer" -> "warm", "setting" -> "set"."""
+    for suffix in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3 and not word.endswith("ss"):
+            word = word[: -len(suffix)]
+            # Undouble the final consonant left by "-ing", "-ed" and "-er"
+            if len(word) > 3 and word[-1] == word[-2] and word[-1] not in "aeiouls":
+                word = word[:-1]
+            break
+    return word
+
+
+def _tokenize(text: str) -> list[str]:
+    """Lowercase stemmed words, with camelCase and dotted names split."""
+    words = re.findall(r"[A-Z]?[a-z]+|[A-Z]+(?![a-z])|\d+", text)
+    return [_stem(word) for word in (w.lower() for w in words) if word not in _STOPWORDS]
+
+
+def _function_text(function: dict) -> str:
+    """Searchable text of a function definition. The name is repeated to weigh more than descriptions."""
+    parts = [function["name"], function["name"], function.get("description", "")]
+    for name, schema in function.get("parameters", {}).get("properties", {}).items():
+        parts += [name, schema.get("description", "")]
+    return " ".join(parts)
+
+
+class ToolRetriever:
+    """BM25 index over function names, descriptions and parameters.
+
+    Built once from the function catalog; `search` selects the few functions relevant to an utterance, so that only
+    those are put in the tool calling prompt.
+    """
+
+    def __init__(self, functions: list[dict], k1: float = 1.2, b: float = 0.75):
+        self.functions = functions
+        self.k1 = k1
+        self.b = b
+
+        self._term_freqs = [Counter(_tokenize(_function_text(f))) for f in functions]
+        self._lengths = [sum(tf.values()) for tf in self._term_freqs]
+        self._avg_length = sum(self._lengths) / max(len(functions), 1)
+
+        doc_freqs = Counter(term for tf in self._term_freqs for term in tf)
+        n = len(functions)
+        self._idf = {term: math.log(1 + (n - df + 0.5) / (df + 0.5)) for term, df in doc_freqs.items()}
+
+    def _expand(self, term: str) -> list[str]:
+        """Catalog terms a query term matches: itself, or else those it is a prefix of ("temp" -> "temperatur")."""
+        if term in self._idf:
+            return [term]
+        if len(term) < 4:
+            return []
+        return [t for t in self._idf if t.startswith(term)]
+
+    def scores(self, query: str) -> list[float]:
+        """BM25 score of every function for the query."""
+        terms = [t for term in _tokenize(query) for t in self._expand(term)]
+        scores = []
+        for tf, length in zip(self._term_freqs, self._lengths, strict=True):
+            norm = self.k1 * (1 - self.b + self.b * length / self._avg_length)
+            scores.append(sum(self._idf[t] * tf[t] * (self.k1 + 1) / (tf[t] + norm) for t in terms if t in tf))
+        return scores
+
+    def search(self, query: str, top_k: int) -> list[dict]:
+        """Top-k functions for the query, in catalog order.
+
+        Keeping catalog order makes prompts of similar queries share a longer prefix. When no word of the query
+        matches the catalog (e.g. "I am cold"), every function is returned, so that the model can still pick the
+        right one.
+        """
+        scores = self.scores(query)
+        ranked = sorted((i for i, s in enumerate(scores) if s > 0), key=lambda i: -scores[i])[:top_k]
+        if not ranked:
+            return self.functions
+        return [self.functions[i] for i in sorted(ranked)]
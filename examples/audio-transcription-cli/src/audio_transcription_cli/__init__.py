@@ -1,8 +1,6 @@
 """Real-time audio-to-speech recognition using LFM2-Audio-1.5B."""
 
-from .audio_preprocessing import save_raw_audio_as_wav
-from .config import Config
-from .model_wrapper import LFM2AudioWrapper
+import importlib
 
 __version__ = "0.1.0"
 __all__ = [
@@ -11,6 +9,21 @@ __all__ = [
     "Config",
 ]
 
+# Public name -> defining module. Imported on first access so that the CLI
+# can parse arguments without loading NumPy, pydantic or huggingface_hub.
+_LAZY_IMPORTS = {
+    "save_raw_audio_as_wav": ".audio_preprocessing",
+    "LFM2AudioWrapper": ".model_wrapper",
+    "Config": ".config",
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY_IMPORTS:
+        module = importlib.import_module(_LAZY_IMPORTS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 def hello() -> str:
     return "Hello from audio-demo!"
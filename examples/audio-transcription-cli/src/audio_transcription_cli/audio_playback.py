@@ -1,89 +1,122 @@
 """Audio playback module for synchronizing audio with real-time transcription."""
 
-import os
 import threading
-from pathlib import Path
+import time
+
+import numpy as np
 
 
 class AudioPlayer:
-    """Audio player for background playback during transcription."""
+    """
+    Plays an already decoded buffer and reports how much of it has been heard.
 
-    def __init__(self, audio_file_path: str | Path):
+    Samples are fed to the output device from memory on PyAudio's callback
+    thread, so nothing is decoded twice and the playback position is known
+    to within one device buffer.
+    """
+
+    def __init__(
+        self, audio_data: np.ndarray, sample_rate: int, frames_per_buffer: int = 1024
+    ):
         """
         Initialize audio player.
 
         Args:
-            audio_file_path: Path to audio file to play
+            audio_data: Decoded float32 audio, shaped (frames,) or
+                (frames, channels)
+            sample_rate: Sample rate of the audio data
+            frames_per_buffer: Frames handed to the device per callback
         """
-        self.audio_file_path = str(audio_file_path)
-        self._playback_thread: threading.Thread | None = None
-        self._stop_event = threading.Event()
-        self._is_playing = False
-
-        # Validate file exists
-        if not os.path.exists(self.audio_file_path):
-            raise FileNotFoundError(f"Audio file not found: {self.audio_file_path}")
+        self.audio_data = np.ascontiguousarray(audio_data, dtype=np.float32)
+        self.sample_rate = sample_rate
+        self.channels = 1 if self.audio_data.ndim == 1 else self.audio_data.shape[1]
+        self.frames_per_buffer = frames_per_buffer
+
+        self._pyaudio = None
+        self._stream = None
+        self._lock = threading.Lock()
+        self._frames_played = 0  # Frames handed to the device so far
+        self._block_start = 0  # First frame of the block handed over last
+        self._callback_time: float | None = None  # time.monotonic() of last callback
+        self._output_latency = 0.0
+        self._finished = False
 
     def start_playback(self) -> None:
-        """Start audio playback in background thread."""
-        if self._is_playing:
+        """Open the default output device and start playing."""
+        if self._stream is not None:
             return
 
-        self._stop_event.clear()
-        self._playback_thread = threading.Thread(
-            target=self._playback_worker, daemon=True
+        import pyaudio
+
+        self._pyaudio = pyaudio.PyAudio()
+        self._stream = self._pyaudio.open(
+            format=pyaudio.paFloat32,
+            channels=self.channels,
+            rate=self.sample_rate,
+            output=True,
+            frames_per_buffer=self.frames_per_buffer,
+            stream_callback=self._callback,
         )
-        self._playback_thread.start()
+        self._output_latency = self._stream.get_output_latency()
+        self._stream.start_stream()
 
     def stop_playback(self) -> None:
         """Stop audio playback and cleanup."""
-        if not self._is_playing:
-            return
-
-        self._stop_event.set()
-
-        # Wait for thread to finish
-        if self._playback_thread and self._playback_thread.is_alive():
-            self._playback_thread.join(timeout=1.0)
-
-        self._is_playing = False
+        if self._stream is not None:
+            self._stream.stop_stream()
+            self._stream.close()
+            self._stream = None
+        if self._pyaudio is not None:
+            self._pyaudio.terminate()
+            self._pyaudio = None
 
     def is_playing(self) -> bool:
         """Check if audio is currently playing."""
-        return self._is_playing
-
-    def _playback_worker(self) -> None:
-        """Worker thread for audio playback."""
-        try:
-            import time
-
-            import pygame
-
-            # Initialize pygame mixer
-            pygame.mixer.init()
-
-            self._is_playing = True
+        return self._stream is not None and not self._finished
 
-            # Load and play audio
-            pygame.mixer.music.load(self.audio_file_path)
-            pygame.mixer.music.play()
-
-            # Wait for completion or stop signal
-            while pygame.mixer.music.get_busy() and not self._stop_event.is_set():
-                time.sleep(0.1)
-
-        except Exception as e:
-            if not self._stop_event.is_set():
-                print(f"⚠️ Audio playback error: {e}")
-        finally:
-            self._is_playing = False
-            try:
-                import pygame
+    def position(self) -> float:
+        """
+        Seconds of audio the listener has heard so far.
 
-                pygame.mixer.music.stop()
-                pygame.mixer.quit()
-            except:
-                pass
+        Interpolates between device callbacks and subtracts the output
+        latency. Once the buffer is exhausted it keeps advancing at wall-clock
+        speed, so callers waiting past the end are not stalled.
+        """
+        with self._lock:
+            block_start = self._block_start
+            block_frames = self._frames_played - block_start
+            callback_time = self._callback_time
+            finished = self._finished
+
+        if callback_time is None:
+            return 0.0
+
+        elapsed = time.monotonic() - callback_time
+        if not finished:
+            elapsed = min(elapsed, block_frames / self.sample_rate)
+
+        return max(0.0, block_start / self.sample_rate + elapsed - self._output_latency)
+
+    def _callback(self, in_data, frame_count, time_info, status):
+        """PyAudio callback: hand the next frames of the buffer to the device."""
+        import pyaudio
+
+        with self._lock:
+            start = self._frames_played
+            frames = self.audio_data[start : start + frame_count]
+            self._block_start = start
+            self._frames_played = start + len(frames)
+            self._callback_time = time.monotonic()
+            self._finished = len(frames) < frame_count
+
+        if self._finished:
+            # Pad the last buffer with silence and end the stream
+            padding = np.zeros(
+                (frame_count - len(frames), *frames.shape[1:]), dtype=np.float32
+            )
+            return np.concatenate([frames, padding]).tobytes(), pyaudio.paComplete
+
+        return frames.tobytes(), pyaudio.paContinue
 
     def __enter__(self):
         """Context manager entry."""
@@ -94,18 +127,59 @@ class AudioPlayer:
         self.stop_playback()
 
 
-def create_audio_player(audio_file_path: str | Path) -> AudioPlayer | None:
+class MediaClock:
+    """
+    Single timeline shared by playback and the chunk scheduler.
+
+    With a player attached, media time is the position the listener has
+    actually heard. Without one it is wall-clock time since `start()`.
+    """
+
+    def __init__(self, player: AudioPlayer | None = None):
+        """
+        Initialize the clock. Media time does not advance until `start()`.
+
+        Args:
+            player: Audio player whose position drives the clock
+        """
+        self.player = player
+        self._start: float | None = None
+
+    def start(self) -> None:
+        """Start the clock, and playback if a player is attached."""
+        self._start = time.monotonic()
+        if self.player:
+            try:
+                self.player.start_playback()
+            except Exception as e:
+                print(f"⚠️ Audio playback error: {e}")
+                self.player.stop_playback()
+                self.player = None
+
+    def time(self) -> float:
+        """Current media time in seconds."""
+        if self._start is None:
+            return 0.0
+        if self.player:
+            return self.player.position()
+        return time.monotonic() - self._start
+
+
+def create_audio_player(audio_data: np.ndarray, sample_rate: int) -> AudioPlayer | None:
     """
     Create audio player instance.
 
     Args:
-        audio_file_path: Path to audio file
+        audio_data: Decoded audio to play
+        sample_rate: Sample rate of the audio data
 
     Returns:
         AudioPlayer instance or None if creation fails
     """
     try:
-        return AudioPlayer(audio_file_path)
+        import pyaudio  # noqa: F401
+
+        return AudioPlayer(audio_data, sample_rate)
     except Exception as e:
         print(f"⚠️ Audio playback not available: {e}")
         return None
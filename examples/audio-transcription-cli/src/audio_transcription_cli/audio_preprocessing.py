@@ -1,11 +1,18 @@
 """Audio preprocessing module for LFM2 model compatibility."""
 
+import io
 import tempfile
 from collections.abc import Iterator
+from math import gcd
 
 import numpy as np
 import soundfile as sf
 
+from .vad import EnergyVAD
+
+# Rate the LFM2-Audio encoder works at; other rates are resampled to it
+MODEL_SAMPLE_RATE = 16000
+
 
 def save_raw_audio_as_wav(audio_data: np.ndarray, sample_rate: int = 48000) -> str:
     """
@@ -30,19 +37,93 @@ def save_raw_audio_as_wav(audio_data: np.ndarray, sample_rate: int = 48000) -> s
     return temp_path
 
 
+def encode_wav_bytes(audio_data: np.ndarray, sample_rate: int = 48000) -> bytes:
+    """
+    Encode raw audio data as an in-memory WAV file.
+
+    Args:
+        audio_data: Raw audio data
+        sample_rate: Sample rate of the audio data
+
+    Returns:
+        WAV file contents
+    """
+    buffer = io.BytesIO()
+    sf.write(buffer, audio_data, sample_rate, format="WAV", subtype="PCM_16")
+    return buffer.getvalue()
+
+
+def to_model_format(
+    audio_data: np.ndarray,
+    sample_rate: int,
+    target_sample_rate: int = MODEL_SAMPLE_RATE,
+) -> tuple[np.ndarray, int]:
+    """
+    Downmix to mono and resample to the model's native rate.
+
+    Resampling is polyphase (upsample, FIR low-pass, downsample in one pass),
+    which is exact for rational rate ratios such as 48000 -> 16000 and 44100
+    -> 16000.
+
+    Args:
+        audio_data: Audio shaped (frames,) or (frames, channels)
+        sample_rate: Sample rate of the audio data
+        target_sample_rate: Sample rate to convert to
+
+    Returns:
+        Tuple of (mono float32 audio, target_sample_rate)
+    """
+    if audio_data.ndim > 1:
+        audio_data = audio_data.mean(axis=1)
+
+    if sample_rate != target_sample_rate:
+        from scipy.signal import resample_poly
+
+        divisor = gcd(sample_rate, target_sample_rate)
+        audio_data = resample_poly(
+            audio_data, target_sample_rate // divisor, sample_rate // divisor
+        )
+
+    return np.ascontiguousarray(audio_data, dtype=np.float32), target_sample_rate
+
+
 class AudioChunker:
     """Handles chunking of audio files for real-time processing."""
 
-    def __init__(self, chunk_duration: float = 2.0, overlap: float = 0.5):
+    STRATEGIES = ["fixed", "vad"]
+
+    def __init__(
+        self,
+        chunk_duration: float = 2.0,
+        overlap: float = 0.5,
+        strategy: str = "fixed",
+        vad: EnergyVAD | None = None,
+        target_sample_rate: int | None = MODEL_SAMPLE_RATE,
+    ):
         """
         Initialize audio chunker.
 
         Args:
-            chunk_duration: Duration of each chunk in seconds
-            overlap: Overlap between chunks in seconds
+            chunk_duration: Duration of each chunk in seconds (maximum
+                duration with the "vad" strategy)
+            overlap: Overlap between chunks in seconds ("fixed" strategy only)
+            strategy: "fixed" for evenly spaced overlapping windows, "vad" to
+                skip silence and cut chunks at pauses
+            vad: Voice activity detector for the "vad" strategy
+            target_sample_rate: Rate audio is converted to (as mono) when
+                loaded, or None to keep the source format
         """
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"Unsupported chunking strategy: {strategy}")
+
+        if strategy == "vad" and vad is None:
+            vad = EnergyVAD()
+
         self.chunk_duration = chunk_duration
         self.overlap = overlap
+        self.strategy = strategy
+        self.vad = vad
+        self.target_sample_rate = target_sample_rate
 
     def get_audio_info(self, audio_file_path: str) -> tuple[float, int, int]:
         """
@@ -57,20 +138,65 @@ class AudioChunker:
         info = sf.info(audio_file_path)
         return info.duration, info.samplerate, info.frames
 
-    def create_chunks(self, audio_file_path: str) -> Iterator[tuple[str, float, float]]:
+    def load_audio(self, audio_file_path: str) -> tuple[np.ndarray, int]:
         """
-        Create audio chunks from file with timing information.
+        Decode the whole audio file into a single buffer.
+
+        The buffer is converted to mono at `target_sample_rate` once, here,
+        so every chunk cut from it is already in the model's input format.
 
         Args:
             audio_file_path: Path to audio file
 
-        Yields:
-            Tuple of (chunk_file_path, start_time, end_time)
+        Returns:
+            Tuple of (audio_data, sample_rate)
         """
-        # Get audio info
-        total_duration, sample_rate, total_frames = self.get_audio_info(audio_file_path)
+        audio_data, sample_rate = sf.read(audio_file_path, dtype="float32")
+        return self.prepare_audio(audio_data, sample_rate)
 
-        print(f"📊 Audio file: {total_duration:.1f}s, {sample_rate}Hz")
+    def prepare_audio(
+        self, audio_data: np.ndarray, sample_rate: int
+    ) -> tuple[np.ndarray, int]:
+        """
+        Convert already decoded audio to mono at `target_sample_rate`.
+
+        Args:
+            audio_data: Audio shaped (frames,) or (frames, channels)
+            sample_rate: Sample rate of the audio data
+
+        Returns:
+            Tuple of (audio_data, sample_rate)
+        """
+        if self.target_sample_rate is None:
+            return audio_data, sample_rate
+        return to_model_format(audio_data, sample_rate, self.target_sample_rate)
+
+    def iter_windows(
+        self, audio_data: np.ndarray, sample_rate: int
+    ) -> Iterator[tuple[np.ndarray, float, float]]:
+        """
+        Slice a decoded buffer into overlapping windows without copying.
+
+        Args:
+            audio_data: Decoded audio, as returned by `load_audio`
+            sample_rate: Sample rate of the audio data
+
+        Yields:
+            Tuple of (chunk_view, start_time, end_time). Each chunk is a NumPy
+            view into `audio_data`, so it must not be modified in place.
+        """
+        if self.strategy == "vad":
+            for start_frame, end_frame in self.vad.iter_windows(
+                audio_data, sample_rate, self.chunk_duration
+            ):
+                yield (
+                    audio_data[start_frame:end_frame],
+                    start_frame / sample_rate,
+                    end_frame / sample_rate,
+                )
+            return
+
+        total_frames = len(audio_data)
 
         # Calculate chunk parameters
         chunk_frames = int(self.chunk_duration * sample_rate)
@@ -78,35 +204,50 @@ class AudioChunker:
         step_frames = chunk_frames - overlap_frames
 
         current_frame = 0
-        chunk_index = 0
 
         while current_frame < total_frames:
             # Calculate chunk boundaries
             start_frame = current_frame
             end_frame = min(current_frame + chunk_frames, total_frames)
 
-            # Calculate timing
-            start_time = start_frame / sample_rate
-            end_time = end_frame / sample_rate
-
-            # Read audio chunk
-            audio_chunk, _ = sf.read(
-                audio_file_path, start=start_frame, frames=end_frame - start_frame
+            yield (
+                audio_data[start_frame:end_frame],
+                start_frame / sample_rate,
+                end_frame / sample_rate,
             )
 
-            # Save chunk as temporary file
-            chunk_path = self._save_chunk(audio_chunk, sample_rate, chunk_index)
-
-            yield chunk_path, start_time, end_time
-
             # Move to next chunk
             current_frame += step_frames
-            chunk_index += 1
 
             # Break if we've reached the end
             if end_frame >= total_frames:
                 break
 
+    def create_chunks(self, audio_file_path: str) -> Iterator[tuple[str, float, float]]:
+        """
+        Create audio chunks from file with timing information.
+
+        The file is decoded once; each window is then written to its own
+        temporary WAV for consumers that need a path on disk.
+
+        Args:
+            audio_file_path: Path to audio file
+
+        Yields:
+            Tuple of (chunk_file_path, start_time, end_time)
+        """
+        audio_data, sample_rate = self.load_audio(audio_file_path)
+
+        print(f"📊 Audio file: {len(audio_data) / sample_rate:.1f}s, {sample_rate}Hz")
+
+        for chunk_index, (audio_chunk, start_time, end_time) in enumerate(
+            self.iter_windows(audio_data, sample_rate)
+        ):
+            # Save chunk as temporary file
+            chunk_path = self._save_chunk(audio_chunk, sample_rate, chunk_index)
+
+            yield chunk_path, start_time, end_time
+
     def _save_chunk(
         self, audio_data: np.ndarray, sample_rate: int, chunk_index: int
     ) -> str:
@@ -0,0 +1,230 @@
+"""Resident llama.cpp audio server that transcribes chunks without model reloads."""
+
+import base64
+import json
+import socket
+import subprocess
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+from .model_downloader import ModelDownloader
+from .transcription_result import TranscriptionResult
+
+# TranscriptionResult timing names -> llama.cpp server `timings` fields
+_SERVER_TIMINGS = {"prompt_ms": "prompt_ms", "decode_ms": "predicted_ms"}
+
+
+def _find_available_port(host: str) -> int:
+    """Let the OS pick a free port on the given interface."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind((host, 0))
+        return s.getsockname()[1]
+
+
+class AudioServerWorker:
+    """Long-lived audio server process that transcribes WAV chunks over HTTP."""
+
+    def __init__(
+        self,
+        model_downloader: ModelDownloader,
+        host: str = "127.0.0.1",
+        port: int | None = None,
+        parallel: int = 1,
+        startup_timeout: float = 120.0,
+    ):
+        """
+        Initialize the worker. The server process is not started until `start()`.
+
+        Args:
+            model_downloader: ModelDownloader object with model paths and settings
+            host: Interface the server binds to
+            port: Port the server listens on (a free one is picked if None)
+            parallel: Number of requests the server decodes concurrently
+            startup_timeout: Seconds to wait for the models to load
+        """
+        self.model_downloader = model_downloader
+        self.host = host
+        self.port = port
+        self.parallel = parallel
+        self.startup_timeout = startup_timeout
+        self._process: subprocess.Popen | None = None
+
+    @property
+    def base_url(self) -> str:
+        """Base URL of the running server."""
+        return f"http://{self.host}:{self.port}"
+
+    def is_available(self) -> bool:
+        """Check whether the platform runner ships the audio server binary."""
+        return Path(self.model_downloader.llama_server_binary_path).exists()
+
+    def is_running(self) -> bool:
+        """Check if the server process is alive."""
+        return self._process is not None and self._process.poll() is None
+
+    def start(self) -> None:
+        """
+        Spawn the server and block until the models are loaded.
+
+        Raises:
+            FileNotFoundError: If the server binary is missing
+            RuntimeError: If the server exits or does not become healthy in time
+        """
+        if self.is_running():
+            return
+
+        if not self.is_available():
+            raise FileNotFoundError(
+                f"Audio server binary not found: "
+                f"{self.model_downloader.llama_server_binary_path}"
+            )
+
+        if self.port is None:
+            self.port = _find_available_port(self.host)
+
+        cmd = self.model_downloader.get_server_command(
+            self.host, self.port, self.parallel
+        )
+
+        print("🔥 Starting resident audio server...")
+        start = time.time()
+        self._process = subprocess.Popen(
+            cmd,
+            # Server logs are verbose and never read; a pipe would fill up
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+
+        while time.time() - start < self.startup_timeout:
+            if self._process.poll() is not None:
+                returncode = self._process.returncode
+                self._process = None
+                raise RuntimeError(
+                    f"Audio server exited during startup with code {returncode}"
+                )
+            if self._is_healthy():
+                print(f"✅ Audio server ready ({time.time() - start:.1f}s)")
+                return
+            time.sleep(0.25)
+
+        self.stop()
+        raise RuntimeError(
+            f"Audio server did not become healthy after {self.startup_timeout:.0f}s"
+        )
+
+    def stop(self) -> None:
+        """Terminate the server process."""
+        if self._process is None:
+            return
+
+        self._process.terminate()
+        try:
+            self._process.wait(timeout=4)
+        except subprocess.TimeoutExpired:
+            self._process.kill()
+            self._process.wait()
+        self._process = None
+
+    def transcribe_wav_bytes(
+        self, wav_bytes: bytes, timeout: float = 30.0
+    ) -> TranscriptionResult:
+        """
+        Transcribe an in-memory WAV file.
+
+        The server streams JSON events, so text and timings are read directly
+        from the response without any stdout scraping.
+
+        Args:
+            wav_bytes: Encoded WAV file contents
+            timeout: Request timeout in seconds
+
+        Returns:
+            Transcribed text and server-reported timings
+
+        Raises:
+            RuntimeError: If the server is not running or the request fails
+        """
+        if not self.is_running():
+            raise RuntimeError("Audio server is not running")
+
+        payload = {
+            "model": "",
+            "messages": [
+                {"role": "system", "content": self.model_downloader.asr_prompt},
+                {
+                    "role": "user",
+                    "content": [
+                        {
+                            "type": "input_audio",
+                            "input_audio": {
+                                "data": base64.b64encode(wav_bytes).decode("utf-8"),
+                                "format": "wav",
+                            },
+                        }
+                    ],
+                },
+            ],
+            "stream": True,
+            "max_tokens": 512,
+        }
+        request = urllib.request.Request(
+            f"{self.base_url}/v1/chat/completions",
+            data=json.dumps(payload).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+        )
+
+        text_parts = []
+        timings = {}
+        request_start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request, timeout=timeout) as response:
+                # Server-sent events, one JSON object per `data:` line
+                for raw_line in response:
+                    line = raw_line.decode("utf-8", errors="replace").strip()
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[len("data:") :].strip()
+                    if data == "[DONE]":
+                        break
+                    event = json.loads(data)
+                    choices = event.get("choices") or []
+                    if choices:
+                        content = choices[0].get("delta", {}).get("content")
+                        if content:
+                            text_parts.append(content)
+                    # llama.cpp attaches timings to the final event
+                    if "timings" in event:
+                        timings = event["timings"]
+        except (urllib.error.URLError, TimeoutError) as e:
+            raise RuntimeError(f"Audio server request failed: {e}") from e
+        inference_ms = (time.perf_counter() - request_start) * 1000
+
+        return TranscriptionResult(
+            text=" ".join("".join(text_parts).split()),
+            timings={
+                name: float(timings[key])
+                for name, key in _SERVER_TIMINGS.items()
+                if key in timings
+            }
+            | {"inference_ms": inference_ms},
+        )
+
+    def _is_healthy(self) -> bool:
+        """Query the llama.cpp `/health` endpoint."""
+        try:
+            with urllib.request.urlopen(f"{self.base_url}/health", timeout=1.0) as r:
+                return r.status == 200
+        except (urllib.error.URLError, ConnectionError, TimeoutError):
+            return False
+
+    def __enter__(self):
+        """Context manager entry."""
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit with cleanup."""
+        self.stop()
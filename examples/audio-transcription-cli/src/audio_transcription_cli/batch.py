@@ -0,0 +1,154 @@
+"""Offline batch transcription of audio archives across a process pool."""
+
+import glob
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing.util import Finalize
+from pathlib import Path
+
+import soundfile as sf
+
+from .config import Config
+from .model_downloader import ModelDownloader
+from .model_wrapper import LFM2AudioWrapper
+
+AUDIO_EXTENSIONS = {".wav", ".mp3", ".flac", ".ogg"}
+
+# One model wrapper per pool process, created by `_init_worker`
+_worker_model: LFM2AudioWrapper | None = None
+
+
+def expand_audio_inputs(pattern: str) -> list[Path]:
+    """
+    Resolve a directory or glob pattern to a sorted list of audio files.
+
+    Args:
+        pattern: Directory (searched recursively) or glob pattern
+
+    Returns:
+        List of audio file paths
+    """
+    if os.path.isdir(pattern):
+        candidates = Path(pattern).rglob("*")
+    else:
+        candidates = (Path(p) for p in glob.glob(pattern, recursive=True))
+
+    return sorted(
+        p for p in candidates if p.is_file() and p.suffix.lower() in AUDIO_EXTENSIONS
+    )
+
+
+def _init_worker(config: Config) -> None:
+    """Load the model once per pool process."""
+    global _worker_model
+
+    model_downloader = ModelDownloader(target_dir=config.base_dir)
+    _worker_model = LFM2AudioWrapper(model_downloader, config)
+    _worker_model.start()
+
+    # Pool processes skip atexit handlers; stop the audio server on shutdown
+    Finalize(_worker_model, _worker_model.close, exitpriority=10)
+
+
+def _transcribe_file(
+    audio_file: Path, chunk_duration: float, overlap: float, chunk_strategy: str
+) -> dict:
+    """Transcribe one file in a pool process and return its JSONL record."""
+    record = {"file": str(audio_file)}
+    start = time.time()
+
+    try:
+        duration = sf.info(str(audio_file)).duration
+        transcription, num_chunks = _worker_model.transcribe_offline(
+            audio_file,
+            chunk_duration=chunk_duration,
+            overlap=overlap,
+            chunk_strategy=chunk_strategy,
+        )
+        elapsed = time.time() - start
+        record.update(
+            {
+                "duration_s": round(duration, 3),
+                "elapsed_s": round(elapsed, 3),
+                "real_time_factor": round(elapsed / duration, 4) if duration else None,
+                "chunks": num_chunks,
+                "transcription": transcription,
+            }
+        )
+    except Exception as e:
+        record.update({"elapsed_s": round(time.time() - start, 3), "error": str(e)})
+
+    return record
+
+
+def transcribe_batch(
+    pattern: str,
+    output_path: str,
+    config: Config,
+    jobs: int = 2,
+    chunk_duration: float = 2.0,
+    overlap: float = 0.5,
+    chunk_strategy: str = "fixed",
+) -> int:
+    """
+    Transcribe every audio file matching `pattern` without real-time pacing.
+
+    Files are fanned out across `jobs` processes, each holding its own copy of
+    the model. One JSON line per file is appended to `output_path` as soon as
+    that file finishes, so an interrupted run keeps its finished results.
+
+    Args:
+        pattern: Directory or glob pattern of audio files
+        output_path: JSONL file to append results to
+        config: Configuration object
+        jobs: Number of worker processes
+        chunk_duration: Duration of each chunk in seconds
+        overlap: Overlap between chunks in seconds
+        chunk_strategy: "fixed" windows or "vad" to skip silence
+
+    Returns:
+        Number of files that failed
+    """
+    audio_files = expand_audio_inputs(pattern)
+    if not audio_files:
+        print(f"❌ No audio files found for: {pattern}")
+        return 0
+
+    jobs = max(1, min(jobs, len(audio_files)))
+    print(f"📦 Batch transcription of {len(audio_files)} files with {jobs} processes")
+    print(f"📝 Writing results to {output_path}")
+
+    failures = 0
+    batch_start = time.time()
+
+    with (
+        ProcessPoolExecutor(
+            max_workers=jobs, initializer=_init_worker, initargs=(config,)
+        ) as executor,
+        open(output_path, "a", encoding="utf-8") as out,
+    ):
+        futures = [
+            executor.submit(
+                _transcribe_file, audio_file, chunk_duration, overlap, chunk_strategy
+            )
+            for audio_file in audio_files
+        ]
+        for done, future in enumerate(as_completed(futures), start=1):
+            record = future.result()
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            out.flush()
+
+            progress = f"[{done}/{len(audio_files)}] {record['file']}"
+            if "error" in record:
+                failures += 1
+                print(f"❌ {progress}: {record['error']}")
+            else:
+                print(
+                    f"✅ {progress} "
+                    f"({record['elapsed_s']:.1f}s, RTF {record['real_time_factor']})"
+                )
+
+    print(f"🎯 Batch complete in {time.time() - batch_start:.1f}s, {failures} failed")
+    return failures
@@ -0,0 +1,153 @@
+"""Compare model quantizations on speed, memory and accuracy."""
+
+import json
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import soundfile as sf
+
+from .config import Config
+from .model_downloader import ModelDownloader
+from .model_wrapper import LFM2AudioWrapper
+from .wer import normalize_words, word_error_rate
+
+# Transcript of examples/harvard.wav in the model repo (Harvard sentences)
+HARVARD_REFERENCE = (
+    "The stale smell of old beer lingers. It takes heat to bring out the odor. "
+    "A cold dip restores health and zest. A salt pickle tastes fine with ham. "
+    "Tacos al pastor are my favorite. A zestful food is the hot cross bun."
+)
+
+
+def _peak_child_rss_mb() -> float:
+    """Peak RSS of the largest finished child process, in MB."""
+    max_rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes on Linux
+    return max_rss / 2**20 if sys.platform == "darwin" else max_rss / 2**10
+
+
+def _benchmark_quantization(
+    config: Config,
+    quantization: str,
+    references: list[tuple[Path, str]],
+    chunk_duration: float,
+    overlap: float,
+) -> dict:
+    """Transcribe the reference set with one quantization, in a fresh process."""
+    model_downloader = ModelDownloader(
+        target_dir=config.base_dir, quantization=quantization
+    )
+    model = LFM2AudioWrapper(model_downloader, config)
+
+    audio_seconds = 0.0
+    elapsed = 0.0
+    word_errors = 0.0
+    reference_words = 0
+
+    try:
+        # Model loading is excluded from the real-time factor
+        model.start()
+
+        for audio_path, reference in references:
+            audio_seconds += sf.info(str(audio_path)).duration
+
+            start = time.time()
+            transcription, _ = model.transcribe_offline(
+                audio_path, chunk_duration=chunk_duration, overlap=overlap
+            )
+            elapsed += time.time() - start
+
+            # Weight each file by its length for a corpus-level WER
+            num_words = len(normalize_words(reference))
+            word_errors += word_error_rate(reference, transcription) * num_words
+            reference_words += num_words
+    finally:
+        # The runner must have exited for its peak RSS to be reported
+        model.close()
+
+    return {
+        "quantization": quantization,
+        "files": len(references),
+        "audio_s": round(audio_seconds, 3),
+        "elapsed_s": round(elapsed, 3),
+        "real_time_factor": round(elapsed / audio_seconds, 4),
+        "peak_rss_mb": round(_peak_child_rss_mb(), 1),
+        "wer": round(word_errors / reference_words, 4),
+    }
+
+
+def run_benchmark(
+    config: Config,
+    quantizations: list[str],
+    references: list[tuple[Path, str]],
+    chunk_duration: float = 2.0,
+    overlap: float = 0.5,
+    output_path: str | None = None,
+) -> list[dict]:
+    """
+    Benchmark each quantization on a reference set.
+
+    Every quantization runs in its own process, so the reported peak RSS
+    covers only the runner that loaded that quantization.
+
+    Args:
+        config: Configuration object
+        quantizations: Quantizations to compare, e.g. ["Q4_0", "Q8_0", "F16"]
+        references: List of (audio_path, reference_transcript)
+        chunk_duration: Duration of each chunk in seconds
+        overlap: Overlap between chunks in seconds
+        output_path: Optional JSONL file to append one result per quantization to
+
+    Returns:
+        One result dict per quantization
+    """
+    results = []
+    for quantization in quantizations:
+        print(f"\n📏 Benchmarking {quantization}")
+
+        model_downloader = ModelDownloader(
+            target_dir=config.base_dir, quantization=quantization
+        )
+        if not model_downloader.download():
+            results.append({"quantization": quantization, "error": "download failed"})
+            continue
+
+        try:
+            with ProcessPoolExecutor(max_workers=1) as executor:
+                result = executor.submit(
+                    _benchmark_quantization,
+                    config,
+                    quantization,
+                    references,
+                    chunk_duration,
+                    overlap,
+                ).result()
+        except Exception as e:
+            print(f"❌ {quantization} failed: {e}")
+            result = {"quantization": quantization, "error": str(e)}
+
+        results.append(result)
+
+    if output_path:
+        with open(output_path, "a", encoding="utf-8") as out:
+            for result in results:
+                out.write(json.dumps(result) + "\n")
+
+    print_benchmark_table(results)
+    return results
+
+
+def print_benchmark_table(results: list[dict]) -> None:
+    """Print one row per quantization."""
+    print(f"\n{'quant':<10}{'RTF':>8}{'peak RSS MB':>14}{'WER':>8}")
+    for r in results:
+        if "error" in r:
+            print(f"{r['quantization']:<10}  ❌ {r['error']}")
+            continue
+        print(
+            f"{r['quantization']:<10}{r['real_time_factor']:>8.3f}"
+            f"{r['peak_rss_mb']:>14.0f}{r['wer']:>8.1%}"
+        )
@@ -38,13 +38,28 @@ class Config(BaseSettings):
         default="llama-lfm2-audio", description="Name of the llama binary"
     )
 
+    # Keep the models resident in a long-lived audio server instead of
+    # spawning the one-shot binary for every chunk
+    persistent_worker: bool = Field(
+        default=True,
+        description="Transcribe through a resident audio server when available",
+    )
+    num_workers: int = Field(
+        default=1, description="Number of chunks transcribed concurrently"
+    )
+
     # Audio settings
-    sample_rate: int = Field(default=48000, description="Audio sample rate in Hz")
+    # Capture at the model's native rate so live audio needs no resampling
+    sample_rate: int = Field(default=16000, description="Audio sample rate in Hz")
     channels: int = Field(default=1, description="Number of audio channels")
     chunk_size: int = Field(default=1024, description="Audio chunk size for processing")
     recording_duration: float = Field(
         default=3.0, description="Duration in seconds for each audio recording chunk"
     )
+    ring_buffer_seconds: float = Field(
+        default=30.0,
+        description="Seconds of live microphone audio kept in the ring buffer",
+    )
 
     # ASR settings
     asr_prompt: str = Field(
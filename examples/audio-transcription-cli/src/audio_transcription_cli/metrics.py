@@ -0,0 +1,134 @@
+"""Per-chunk latency metrics for the transcription pipeline."""
+
+import csv
+import os
+import threading
+from pathlib import Path
+
+import numpy as np
+
+# Stage name -> description, in pipeline order. Runner-reported stages
+# (encode/prompt/decode) are only present when the runner exposes them.
+STAGES = {
+    "queue_lag_ms": "Delay between hearing a chunk's end and its inference start",
+    "write_ms": "Encoding the chunk to WAV (in memory or temp file)",
+    "spawn_ms": "Spawning the one-shot runner process",
+    "inference_ms": "Runner round trip, from request to full output",
+    "parse_ms": "Extracting the transcription from runner output",
+    "encode_ms": "Audio encoder time reported by the runner",
+    "prompt_ms": "Prompt evaluation time reported by the runner",
+    "decode_ms": "Text generation time reported by the runner",
+    "caption_latency_ms": "End to end, from hearing a chunk's end to its caption",
+}
+
+QUANTILES = [0.5, 0.95, 0.99]
+
+
+class LatencyMetrics:
+    """Thread-safe collector of per-chunk stage timings."""
+
+    def __init__(self):
+        """Initialize an empty collector."""
+        self._records: list[dict[str, float]] = []
+        self._lock = threading.Lock()
+
+    def record(self, chunk_index: int, chunk_start: float, timings: dict[str, float]):
+        """
+        Record the stage timings of one chunk.
+
+        Args:
+            chunk_index: Position of the chunk in the audio
+            chunk_start: Start of the chunk in the audio, in seconds
+            timings: Stage name -> milliseconds
+        """
+        row = {"chunk": chunk_index, "chunk_start_s": chunk_start}
+        row.update({k: v for k, v in timings.items() if k in STAGES})
+        with self._lock:
+            self._records.append(row)
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """
+        Summarize every recorded stage.
+
+        Returns:
+            Stage name -> {"count", "mean", "p50", "p95", "p99"}, in milliseconds
+        """
+        with self._lock:
+            records = list(self._records)
+
+        summary = {}
+        for stage in STAGES:
+            values = np.array([r[stage] for r in records if stage in r])
+            if len(values) == 0:
+                continue
+            percentiles = np.percentile(values, [q * 100 for q in QUANTILES])
+            summary[stage] = {
+                "count": len(values),
+                "sum": float(values.sum()),
+                "mean": float(values.mean()),
+            } | {
+                f"p{round(q * 100)}": float(p)
+                for q, p in zip(QUANTILES, percentiles, strict=True)
+            }
+
+        return summary
+
+    def print_summary(self) -> None:
+        """Print a p50/p95/p99 table to the console."""
+        summary = self.summary()
+        if not summary:
+            return
+
+        print("⏱️  Latency per stage (ms):")
+        print(f"   {'stage':<20}{'p50':>10}{'p95':>10}{'p99':>10}{'count':>8}")
+        for stage, s in summary.items():
+            print(
+                f"   {stage:<20}{s['p50']:>10.1f}{s['p95']:>10.1f}{s['p99']:>10.1f}"
+                f"{s['count']:>8}"
+            )
+
+    def write_csv(self, csv_path: str | Path) -> None:
+        """
+        Write one row per chunk with all its stage timings.
+
+        Args:
+            csv_path: Destination CSV file
+        """
+        with self._lock:
+            records = sorted(self._records, key=lambda r: r["chunk"])
+
+        fieldnames = ["chunk", "chunk_start_s", *STAGES]
+        with open(csv_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer.writeheader()
+            writer.writerows(records)
+
+    def write_prometheus(self, prom_path: str | Path) -> None:
+        """
+        Write the summaries in Prometheus text exposition format.
+
+        The file is written next to its destination and renamed into place,
+        as expected by the node_exporter textfile collector.
+
+        Args:
+            prom_path: Destination `.prom` file
+        """
+        name = "transcription_stage_latency_ms"
+        lines = [
+            f"# HELP {name} Per-chunk latency of each transcription stage.",
+            f"# TYPE {name} summary",
+        ]
+        for stage, s in self.summary().items():
+            label = stage.removesuffix("_ms")
+            for q in QUANTILES:
+                lines.append(
+                    f'{name}{{stage="{label}",quantile="{q}"}} '
+                    f"{s[f'p{round(q * 100)}']:.3f}"
+                )
+            lines.append(f'{name}_sum{{stage="{label}"}} {s["sum"]:.3f}')
+            lines.append(f'{name}_count{{stage="{label}"}} {s["count"]}')
+
+        tmp_path = f"{prom_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp_path, prom_path)
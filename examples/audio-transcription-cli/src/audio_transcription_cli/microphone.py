@@ -0,0 +1,253 @@
+"""Live microphone capture into a ring buffer for streaming transcription."""
+
+import threading
+from collections.abc import Iterator
+
+import numpy as np
+
+
+class AudioRingBuffer:
+    """
+    Preallocated ring buffer that hands out contiguous windows without copying.
+
+    Every sample is written twice, at `i` and `i + capacity`, so any window of
+    up to `capacity` samples is a contiguous slice of the backing array and
+    can be returned as a NumPy view, even when it wraps around.
+    """
+
+    def __init__(self, capacity: int):
+        """
+        Initialize the buffer.
+
+        Args:
+            capacity: Number of most recent samples kept
+        """
+        self.capacity = capacity
+        self._data = np.zeros(2 * capacity, dtype=np.float32)
+        self._written = 0  # Total samples ever written
+        self._closed = False
+        self._cond = threading.Condition()
+
+    @property
+    def written(self) -> int:
+        """Total number of samples written so far."""
+        return self._written
+
+    def write(self, samples: np.ndarray) -> None:
+        """
+        Append samples, overwriting the oldest ones when full.
+
+        Args:
+            samples: Mono float32 samples
+        """
+        total = len(samples)
+        samples = samples[-self.capacity :]
+        n = len(samples)
+        pos = (self._written + total - n) % self.capacity
+
+        # Write the primary copy, wrapping once if needed
+        first = min(n, self.capacity - pos)
+        self._data[pos : pos + first] = samples[:first]
+        self._data[: n - first] = samples[first:]
+
+        # Mirror it one capacity further on
+        self._data[pos + self.capacity : pos + self.capacity + first] = samples[:first]
+        self._data[self.capacity : self.capacity + n - first] = samples[first:]
+
+        with self._cond:
+            self._written += total
+            self._cond.notify_all()
+
+    def close(self) -> None:
+        """Signal that no more samples will be written."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def wait_for(self, end: int) -> bool:
+        """
+        Block until at least `end` samples have been written.
+
+        Returns:
+            False if the buffer was closed first
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: self._written >= end or self._closed)
+            return self._written >= end
+
+    def window(self, start: int, end: int) -> np.ndarray:
+        """
+        Get samples [start, end) as a view into the buffer.
+
+        The view is only valid until the producer has written another
+        `capacity - (end - start)` samples, so size the buffer well above the
+        worst-case inference latency.
+
+        Raises:
+            ValueError: If the samples were already overwritten or not yet written
+        """
+        if end - start > self.capacity:
+            raise ValueError("Window is larger than the ring buffer")
+        if start < self._written - self.capacity or end > self._written:
+            raise ValueError(f"Samples [{start}, {end}) are not in the buffer")
+
+        offset = start % self.capacity
+        return self._data[offset : offset + (end - start)]
+
+
+def iter_ring_windows(
+    ring: AudioRingBuffer,
+    sample_rate: int,
+    chunk_duration: float = 2.0,
+    overlap: float = 0.5,
+    max_duration: float | None = None,
+) -> Iterator[tuple[np.ndarray, float, float]]:
+    """
+    Yield overlapping windows from a ring buffer as soon as they are written.
+
+    If the consumer falls a whole buffer behind the producer, the audio that
+    was overwritten is skipped and reported, and windowing resumes from the
+    oldest sample still held.
+
+    Args:
+        ring: Buffer filled by a producer thread
+        sample_rate: Sample rate of the buffered audio
+        chunk_duration: Duration of each window in seconds
+        overlap: Overlap between windows in seconds
+        max_duration: Stop after this many seconds of audio (None to run
+            until the buffer is closed)
+
+    Yields:
+        Tuple of (window_view, start_time, end_time), times relative to the
+        first sample written
+    """
+    chunk_frames = int(chunk_duration * sample_rate)
+    step_frames = chunk_frames - int(overlap * sample_rate)
+    max_frames = int(max_duration * sample_rate) if max_duration is not None else None
+
+    start = 0
+    while max_frames is None or start < max_frames:
+        oldest = ring.written - ring.capacity
+        if start < oldest:
+            dropped = (oldest - start) / sample_rate
+            print(f"\n⚠️ Transcription fell behind, dropped {dropped:.1f}s of audio")
+            start = oldest
+            continue
+
+        end = start + chunk_frames
+        if max_frames is not None:
+            end = min(end, max_frames)
+
+        closed = not ring.wait_for(end)
+        if closed:
+            # Flush the tail written after the last full window
+            end = ring.written
+            if end - start <= chunk_frames - step_frames:
+                break
+
+        try:
+            window = ring.window(start, end)
+        except ValueError:
+            continue  # Overwritten since the check above; skip ahead
+
+        yield window, start / sample_rate, end / sample_rate
+        start += step_frames
+
+        # Break if we've reached the end
+        if closed or (max_frames is not None and end >= max_frames):
+            break
+
+
+class MicrophoneStream:
+    """Captures microphone audio on PyAudio's callback thread."""
+
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        channels: int = 1,
+        frames_per_buffer: int = 1024,
+        buffer_seconds: float = 30.0,
+    ):
+        """
+        Initialize the stream. Capture does not begin until `start()`.
+
+        Args:
+            sample_rate: Capture sample rate in Hz
+            channels: Number of captured channels, downmixed to mono
+            frames_per_buffer: Frames delivered per PyAudio callback
+            buffer_seconds: Seconds of audio kept in the ring buffer
+        """
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.frames_per_buffer = frames_per_buffer
+        self.ring = AudioRingBuffer(int(buffer_seconds * sample_rate))
+        self._pyaudio = None
+        self._stream = None
+
+    def start(self) -> None:
+        """Open the default input device and start capturing."""
+        import pyaudio
+
+        self._pyaudio = pyaudio.PyAudio()
+        self._stream = self._pyaudio.open(
+            format=pyaudio.paInt16,
+            channels=self.channels,
+            rate=self.sample_rate,
+            input=True,
+            frames_per_buffer=self.frames_per_buffer,
+            stream_callback=self._callback,
+        )
+        self._stream.start_stream()
+
+    def stop(self) -> None:
+        """Stop capturing and release the device."""
+        if self._stream is not None:
+            self._stream.stop_stream()
+            self._stream.close()
+            self._stream = None
+        if self._pyaudio is not None:
+            self._pyaudio.terminate()
+            self._pyaudio = None
+        self.ring.close()
+
+    def _callback(self, in_data, frame_count, time_info, status):
+        """PyAudio callback: convert int16 frames and append them to the ring."""
+        import pyaudio
+
+        samples = np.frombuffer(in_data, dtype=np.int16).astype(np.float32) / 32768.0
+        if self.channels > 1:
+            samples = samples.reshape(-1, self.channels).mean(axis=1)
+        self.ring.write(samples)
+        return None, pyaudio.paContinue
+
+    def iter_windows(
+        self,
+        chunk_duration: float = 2.0,
+        overlap: float = 0.5,
+        max_duration: float | None = None,
+    ) -> Iterator[tuple[np.ndarray, float, float]]:
+        """
+        Yield overlapping windows as soon as they have been captured.
+
+        Args:
+            chunk_duration: Duration of each window in seconds
+            overlap: Overlap between windows in seconds
+            max_duration: Stop after this many seconds of audio (None to run
+                until the stream is stopped)
+
+        Yields:
+            Tuple of (window_view, start_time, end_time), times relative to
+            the start of capture
+        """
+        return iter_ring_windows(
+            self.ring, self.sample_rate, chunk_duration, overlap, max_duration
+        )
+
+    def __enter__(self):
+        """Context manager entry."""
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit with cleanup."""
+        self.stop()
@@ -1,14 +1,15 @@
 """Automatic download functionality for llama.cpp builds."""
 
+import hashlib
+import json
+import mmap
 import os
-import shutil
 import stat
 import sys
+import time
 import zipfile
 from pathlib import Path
 
-from huggingface_hub import snapshot_download
-
 from .platform_utils import get_platform_info
 
 
@@ -17,6 +18,8 @@ class ModelDownloader:
 
     REPO_URL = "https://huggingface.co/LiquidAI/LFM2-Audio-1.5B-GGUF"
     SUPPORTED_PLATFORMS = ["android-arm64", "macos-arm64", "ubuntu-arm64", "ubuntu-x64"]
+    # Written after a verified download: file -> {"size", "sha256"}
+    MANIFEST_FILENAME = "manifest.json"
 
     def __init__(self, target_dir: str, quantization: str = "Q8_0"):
         self.target_dir = target_dir
@@ -32,36 +35,89 @@ class ModelDownloader:
         )
         self.audiodecoder_filename = f"audiodecoder-LFM2-Audio-1.5B-{quantization}.gguf"
         self.llama_binary_name = "llama-lfm2-audio"
+        # Resident server names, in order of preference. The runner zips are
+        # not inspected at download time; the first one present is used.
+        self.llama_server_binary_names = [
+            "llama-liquid-audio-server",
+            "llama-lfm2-audio-server",
+        ]
         self.asr_prompt = "Perform ASR."
 
-        self._warm_up_llama_cpp()
-
     @property
     def llama_cpp_binary_dir(self) -> Path:
         """Return the path to the llama-lfm2-audio binary for the current platform."""
-        return Path(self.target_dir) / "runners" / self.platform / f"lfm2-audio-{self.platform}"
+        return (
+            Path(self.target_dir)
+            / "runners"
+            / self.platform
+            / f"lfm2-audio-{self.platform}"
+        )
+
+    @property
+    def llama_server_binary_path(self) -> Path:
+        """
+        Return the path to the resident audio server binary.
+
+        The first candidate name found in the runner directory is used. If
+        none is shipped, the path of the preferred name is returned.
+        """
+        candidates = [
+            self.llama_cpp_binary_dir / name for name in self.llama_server_binary_names
+        ]
+        return next((path for path in candidates if path.exists()), candidates[0])
 
     @property
     def model_path(self) -> Path:
         """Return the path to the main model file."""
         return Path(self.target_dir) / self.model_filename
-    
+
     @property
     def mmproj_path(self) -> Path:
         """Return the path to the mmproj file."""
         return Path(self.target_dir) / self.mmproj_filename
-    
+
     @property
     def audiodecoder_path(self) -> Path:
         """Return the path to the audiodecoder file."""
         return Path(self.target_dir) / self.audiodecoder_filename
-    
+
+    @property
+    def platform_zip_filename(self) -> str:
+        """Return the repo path of the llama.cpp zip for the current platform."""
+        return f"runners/{self.platform}/lfm2-audio-{self.platform}.zip"
+
+    @property
+    def required_files(self) -> list[str]:
+        """Return the repo files needed for this quantization and platform."""
+        return [
+            self.model_filename,
+            self.mmproj_filename,
+            self.audiodecoder_filename,
+            self.platform_zip_filename,
+        ]
+
+    @property
+    def manifest_path(self) -> Path:
+        """Return the path to the download manifest."""
+        return Path(self.target_dir) / self.MANIFEST_FILENAME
+
+    def is_downloaded(self) -> bool:
+        """
+        Check the cached manifest without touching the network.
+
+        This checks file sizes only; the sha256 in the manifest is not
+        recomputed. Files are hashed when they are downloaded, and hashing
+        the model files again on every start would cost seconds.
+        """
+        return self._validate_existing_download()
+
     def download(self) -> bool:
         """
         Download the model files and llama.cpp builds necessary to use them
 
         Steps:
-        1. Git clone the repository
+        1. Download the files for this quantization and platform, verifying
+           their sha256 and resuming partial downloads
         2. Unzip the llama.cpp zip file for the current platform
         3. Fix binary permissions
 
@@ -71,22 +127,22 @@ class ModelDownloader:
         print(f"🔍 Detected platform: {self.platform}")
         print(f"🎯 Target directory: {self.target_dir}")
 
-        # Check if target directory already exists with valid content
+        # Check if target directory already exists with valid content. An
+        # incomplete one is kept so that partial files can be resumed.
         if os.path.exists(self.target_dir):
             if self._validate_existing_download():
                 print(f"✅ Valid download already exists at: {self.target_dir}")
-                
+
                 # Fix binary permissions just in case
                 self._make_llama_cpp_binaries_executable()
 
                 return True
             else:
-                print(f"🧹 Removing incomplete download directory: {self.target_dir}")
-                shutil.rmtree(self.target_dir)
+                print(f"🔁 Resuming incomplete download in: {self.target_dir}")
 
-        # Step 1: Clone the repository
-        print("📥 Step 1: Cloning repository...")
-        if not self._clone_repository():
+        # Step 1: Download the required files
+        print("📥 Step 1: Downloading model files and platform runner...")
+        if not self._download_files():
             return False
 
         # Step 2: Extract platform-specific binaries
@@ -100,6 +156,27 @@ class ModelDownloader:
         print("🎉 Download completed successfully!")
         return True
 
+    def download_example(self, filename: str = "harvard.wav") -> Path:
+        """
+        Download one of the example audio files shipped with the model repo.
+
+        Args:
+            filename: Name of the file in the repo's examples/ directory
+
+        Returns:
+            Path to the downloaded file
+        """
+        from huggingface_hub import hf_hub_download
+
+        repo_id = self.REPO_URL.replace("https://huggingface.co/", "")
+        return Path(
+            hf_hub_download(
+                repo_id=repo_id,
+                filename=f"examples/{filename}",
+                local_dir=self.target_dir,
+            )
+        )
+
     def get_model_command(self, audio_file_path: str) -> list[str]:
         """
         Get command line arguments for llama-lfm2-audio.
@@ -123,52 +200,129 @@ class ModelDownloader:
             "--audio",
             audio_file_path,
         ]
-    
-    def _validate_existing_download(self) -> bool:
-        """Check if the target directory contains a valid download."""
-        target_path = Path(self.target_dir)
-
-        # Check for model files
-        model_files = [
-            target_path / self.model_filename,
-            target_path / self.mmproj_filename,
-            target_path / self.audiodecoder_filename,
+
+    def get_server_command(self, host: str, port: int, parallel: int = 1) -> list[str]:
+        """
+        Get command line arguments for the resident audio server.
+
+        The server loads the model, mmproj and audio decoder once and then
+        serves transcription requests over HTTP.
+
+        Args:
+            host: Interface the server binds to
+            port: Port the server listens on
+            parallel: Number of requests the server decodes concurrently
+
+        Returns:
+            List of command arguments
+        """
+        return [
+            str(self.llama_server_binary_path),
+            "-m",
+            str(self.model_path),
+            "-mm",
+            str(self.mmproj_path),
+            "-mv",
+            str(self.audiodecoder_path),
+            "--host",
+            host,
+            "--port",
+            str(port),
+            "--parallel",
+            str(parallel),
         ]
 
-        for model_file in model_files:
-            if not model_file.exists():
+    def _validate_existing_download(self) -> bool:
+        """
+        Check if the target directory contains a valid download.
+
+        Files were hashed against the manifest when downloaded, so here only
+        their sizes are compared to catch truncated or replaced files.
+        """
+        manifest = self._load_manifest()
+
+        for filename in self.required_files:
+            entry = manifest.get(filename)
+            file_path = Path(self.target_dir) / filename
+            if entry is None or not file_path.exists():
+                return False
+            if file_path.stat().st_size != entry["size"]:
                 return False
 
         # Check for platform-specific binary
-        if not self.llama_cpp_binary_dir.exists():
+        if not (self.llama_cpp_binary_dir / self.llama_binary_name).exists():
             return False
 
-        if not Path(self.llama_binary_name / self.llama_cpp_binary_dir).exists():
-            return False
-        
         return True
 
-    def _clone_repository(self) -> bool:
-        """Clone the Hugging Face repository with all files including LFS."""
+    def _load_manifest(self) -> dict[str, dict]:
+        """Load the manifest written by the last verified download."""
+        try:
+            return json.loads(self.manifest_path.read_text())
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def _sha256(path: Path) -> str:
+        """Compute the sha256 hex digest of a file."""
+        with open(path, "rb") as f:
+            return hashlib.file_digest(f, "sha256").hexdigest()
+
+    def _download_files(self) -> bool:
+        """
+        Download only the files for this quantization and platform.
+
+        Files are written straight into the target directory, without a copy
+        in the Hugging Face cache. Interrupted downloads resume from their
+        partial files, and every file is checked against the sha256 the Hub
+        reports for it.
+        """
         try:
+            from huggingface_hub import HfApi, hf_hub_download
+
             # Extract repo_id from URL
             repo_id = self.REPO_URL.replace("https://huggingface.co/", "")
 
-            print(f"🔄 Downloading llama.cpp builds from: {self.REPO_URL}")
+            print(f"🔄 Downloading {self.quantization} files from: {self.REPO_URL}")
+            remote_files = {
+                f.path: f for f in HfApi().get_paths_info(repo_id, self.required_files)
+            }
+
+            manifest = self._load_manifest()
+            for filename in self.required_files:
+                if filename not in remote_files:
+                    print(f"❌ {filename} not found in {repo_id}")
+                    return False
+
+                remote = remote_files[filename]
+                expected_sha256 = remote.lfs.sha256 if remote.lfs else None
+                file_path = Path(self.target_dir) / filename
+
+                # Skip files a previous run already verified
+                entry = manifest.get(filename)
+                if (
+                    entry is not None
+                    and file_path.exists()
+                    and file_path.stat().st_size == remote.size
+                    and expected_sha256 in (entry["sha256"], None)
+                ):
+                    print(f"✅ Already verified: {filename}")
+                    continue
+
+                print(f"📥 Downloading {filename} ({remote.size / 1e9:.2f} GB)...")
+                hf_hub_download(
+                    repo_id=repo_id, filename=filename, local_dir=self.target_dir
+                )
 
-            # Use huggingface_hub for optimal download
-            print("📦 Using huggingface_hub for optimal download...")
-            # Download to cache first, then get the cache path
-            cache_dir = snapshot_download(
-                repo_id=repo_id,
-                local_dir_use_symlinks=False,  # Download actual files, not symlinks
-            )
+                # Non-LFS files carry a git sha1 only; record their sha256
+                actual_sha256 = self._sha256(file_path)
+                if expected_sha256 and actual_sha256 != expected_sha256:
+                    file_path.unlink()
+                    print(f"❌ Checksum mismatch for {filename}, removed it")
+                    return False
 
-            # Copy from cache to target directory
-            if os.path.exists(self.target_dir):
-                shutil.rmtree(self.target_dir)
-            # TODO: turn into a move operation so we don't take double space on disk
-            shutil.copytree(cache_dir, self.target_dir)
+                manifest[filename] = {"size": remote.size, "sha256": actual_sha256}
+                self.manifest_path.write_text(json.dumps(manifest, indent=2))
 
             print(f"✅ Successfully downloaded builds to {self.target_dir}")
             return True
@@ -182,8 +336,8 @@ class ModelDownloader:
         """Extract the platform-specific llama.cpp binaries from zip file."""
         try:
             zip_filename = f"lfm2-audio-{self.platform}.zip"
-            zip_path = Path(self.target_dir) / 'runners' / self.platform / zip_filename
-            
+            zip_path = Path(self.target_dir) / "runners" / self.platform / zip_filename
+
             if not zip_path.exists():
                 print(f"❌ Platform zip file not found: {zip_path}")
                 available_zips = list(Path(self.target_dir).glob("llama.cpp-*.zip"))
@@ -211,7 +365,7 @@ class ModelDownloader:
     def _make_llama_cpp_binaries_executable(self) -> bool:
         """
         Make the extracted binaries executable.
-        
+
         """
         try:
             for file_path in Path(self.llama_cpp_binary_dir).iterdir():
@@ -250,49 +404,45 @@ class ModelDownloader:
 
         return f"{platform_name}-{arch}"
 
-    def _warm_up_llama_cpp(self):
-        """Pre-load the model to reduce latency for first transcription call."""
-        import subprocess
-        import tempfile
-        import numpy as np
-        import soundfile as sf
-        
-        try:
-            print("🔥 Warming up llama.cpp model...")
-            
-            # Generate a short silent audio file for warming up
-            sample_rate = 16000
-            duration = 0.5  # 0.5 seconds of silence
-            silence = np.zeros(int(sample_rate * duration), dtype=np.float32)
-            
-            # Create temporary file for warm-up audio
-            with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_file:
-                temp_audio_path = temp_file.name
-                
-            # Write silent audio to temp file
-            sf.write(temp_audio_path, silence, sample_rate)
-            
-            # Get command for warm-up
-            cmd = self.get_model_command(temp_audio_path)
-            
-            # Run warm-up with short timeout
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=False,
-                timeout=10,  # Short timeout for warm-up
-                check=False,
-            )
-            
-            # Clean up temp file
-            import os
-            os.unlink(temp_audio_path)
-            
-            if result.returncode == 0:
-                print("✅ Model warm-up completed successfully")
-            else:
-                print("⚠️  Model warm-up completed with warnings (this is normal)")
-                
-        except Exception as e:
-            print(f"⚠️  Model warm-up failed: {e} (transcription will still work)")
-            # Don't raise - warm-up failure shouldn't prevent initialization
\ No newline at end of file
+    def warm_up(self) -> dict[str, float]:
+        """
+        Page the model files into the OS page cache.
+
+        Every runner process maps the GGUF files, so once they are resident
+        loading the models is bound by memory rather than disk bandwidth.
+
+        Returns:
+            Dict with the number of bytes paged in and the seconds it took
+        """
+        start = time.time()
+        total_bytes = 0
+
+        print("🔥 Paging model files into memory...")
+        for path in (self.model_path, self.mmproj_path, self.audiodecoder_path):
+            try:
+                total_bytes += self._page_in(path)
+            except OSError as e:
+                print(f"⚠️  Could not page in {path.name}: {e}")
+
+        elapsed = time.time() - start
+        print(f"✅ Model files resident ({total_bytes / 1e9:.2f} GB in {elapsed:.1f}s)")
+        return {"bytes": total_bytes, "seconds": elapsed}
+
+    @staticmethod
+    def _page_in(path: Path) -> int:
+        """Map a file and touch every page so it stays in the page cache."""
+        size = path.stat().st_size
+        if size == 0:
+            return 0
+
+        with open(path, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                # Ask the kernel to start reading ahead asynchronously
+                if hasattr(mmap, "MADV_WILLNEED"):
+                    mm.madvise(mmap.MADV_WILLNEED)
+
+                # Touch one byte per page so we return once the file is resident
+                for offset in range(0, size, mmap.PAGESIZE):
+                    mm[offset]
+
+        return size
@@ -1,31 +1,162 @@
 """Model wrapper for llama-lfm2-audio binary integration."""
 
 import os
+import re
 import subprocess
 import time
+from collections import deque
+from collections.abc import Callable, Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from pathlib import Path
 
-from .audio_preprocessing import AudioChunker
+import numpy as np
+import soundfile as sf
+
+from .audio_playback import MediaClock, create_audio_player
+from .audio_preprocessing import MODEL_SAMPLE_RATE, AudioChunker, encode_wav_bytes
+from .audio_server import AudioServerWorker
 from .config import Config
+from .metrics import LatencyMetrics
 from .model_downloader import ModelDownloader
+from .stitching import TranscriptStitcher
+from .transcription_result import TranscriptionResult
+from .typewriter import TypewriterDisplay
+from .vad import EnergyVAD
+
+# llama.cpp logs as `function_name: message`. Only the function families
+# llama.cpp and mtmd log from are matched, so speech such as "note: ..." is
+# kept; mtmd audio progress and sampler messages are the unprefixed lines.
+# Anything else on stdout is generated text.
+_LOG_LINE = re.compile(
+    r"^(?:"
+    r"(?:llama|llm|ggml|gguf|clip|mtmd|common|load|print|alloc|build|graph)"
+    r"_[a-z0-9_]*:\s"
+    r"|(?:main|init|generate|warmup|system_info):\s"
+    r"|sampler (?:seed|params|chain):"
+    r"|(?:encoding|decoding) audio\b|audio (?:slice|batch)\b"
+    r")"
+)
+
+# TranscriptionResult timing names -> patterns over the runner logs
+_LOG_TIMINGS = {
+    "encode_ms": re.compile(r"audio slice encoded in (\d+(?:\.\d+)?) ms"),
+    "prompt_ms": re.compile(r"prompt eval time\s*=\s*(\d+(?:\.\d+)?) ms"),
+    "decode_ms": re.compile(r"(?<!prompt )\beval time\s*=\s*(\d+(?:\.\d+)?) ms"),
+}
+
+# Chat-template tokens and the echoed system prompt
+_ARTIFACTS = re.compile(
+    r"\[/?INST\]|</?s>|<\|im_(?:start|end)\|>|\bPerform ASR\.|"
+    r"(?:^|\s)(?:System|User|Assistant):"
+)
+
+
+def _read_as_wav_bytes(audio_path: str) -> bytes:
+    """Read an audio file as WAV bytes, re-encoding any other container."""
+    if Path(audio_path).suffix.lower() == ".wav":
+        with open(audio_path, "rb") as f:
+            return f.read()
+
+    audio_data, sample_rate = AudioChunker().load_audio(audio_path)
+    return encode_wav_bytes(audio_data, sample_rate)
+
 
 class LFM2AudioWrapper:
     """Wrapper for llama-lfm2-audio binary."""
 
-    def __init__(self, model_downloader: ModelDownloader,  config: Config):
+    def __init__(self, model_downloader: ModelDownloader, config: Config):
         """
         Initialize the model wrapper.
 
         Args:
             model_downloader: ModelDownloader object with model paths and settings
+            config: Configuration object with audio and worker settings
         """
         self.model_downloader = model_downloader
         self.config = config
 
+        # Resident audio server, started lazily on first use. Falls back to
+        # one subprocess per chunk if the runner does not ship the server.
+        self._worker: AudioServerWorker | None = None
+        self._worker_checked = False
+
         # # Validate configuration
         # if not self.model_downloader.validate_paths():
         #     raise ValueError("Invalid configuration: missing required files")
 
+    def start(self) -> None:
+        """
+        Start the resident audio server if enabled and available.
+
+        Safe to call more than once. On failure, transcription falls back to
+        spawning the one-shot binary for every chunk.
+        """
+        if self._worker_checked:
+            return
+        self._worker_checked = True
+
+        if not self.config.persistent_worker:
+            return
+
+        worker = AudioServerWorker(
+            self.model_downloader, parallel=self.config.num_workers
+        )
+        if not worker.is_available():
+            names = ", ".join(self.model_downloader.llama_server_binary_names)
+            print(
+                f"⚠️ No audio server binary ({names}) in "
+                f"{self.model_downloader.llama_cpp_binary_dir}, "
+                "using one process per chunk"
+            )
+            return
+
+        try:
+            worker.start()
+            self._worker = worker
+        except Exception as e:
+            print(f"⚠️ Audio server failed to start: {e}")
+            print("📝 Falling back to one process per chunk")
+
+    def warm_up(self) -> dict:
+        """
+        Get the runner ready before the first chunk arrives.
+
+        Pages the model files into the OS cache, starts the resident audio
+        server and prints a readiness report.
+
+        Returns:
+            Readiness report with the paged-in bytes, the time it took and
+            whether the resident server is running
+        """
+        report = self.model_downloader.warm_up()
+        self.start()
+        report["resident_server"] = self._worker is not None
+
+        mode = (
+            f"resident audio server at {self._worker.base_url}"
+            if self._worker
+            else "one process per chunk"
+        )
+        print(f"🟢 Ready: {mode}")
+        return report
+
+    def close(self) -> None:
+        """Stop the resident audio server, if any."""
+        if self._worker:
+            self._worker.stop()
+            self._worker = None
+        self._worker_checked = False
+
+    def __enter__(self):
+        """Context manager entry."""
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit with cleanup."""
+        self.close()
+
     def transcribe_audio_file(self, audio_file_path: str | Path) -> str:
         """
         Transcribe audio file to text using LFM2 model.
@@ -36,6 +167,23 @@ class LFM2AudioWrapper:
         Returns:
             Transcribed text
 
+        Raises:
+            RuntimeError: If transcription fails
+        """
+        return self.transcribe_audio_file_detailed(audio_file_path).text
+
+    def transcribe_audio_file_detailed(
+        self, audio_file_path: str | Path
+    ) -> TranscriptionResult:
+        """
+        Transcribe audio file, keeping the timings reported by the runner.
+
+        Args:
+            audio_file_path: Path to audio file
+
+        Returns:
+            Transcribed text and per-stage timings
+
         Raises:
             RuntimeError: If transcription fails
         """
@@ -45,6 +193,10 @@ class LFM2AudioWrapper:
         if not os.path.exists(audio_path):
             raise FileNotFoundError(f"Audio file not found: {audio_path}")
 
+        self.start()
+        if self._worker:
+            return self._worker.transcribe_wav_bytes(_read_as_wav_bytes(audio_path))
+
         # Get command arguments
         # cmd = self.config.get_model_command(audio_path)
         cmd = self.model_downloader.get_model_command(audio_path)
@@ -52,91 +204,90 @@ class LFM2AudioWrapper:
         try:
             # Run the model from current working directory (not base_dir)
             # since paths in cmd are already absolute
-            result = subprocess.run(
+            spawn_start = time.perf_counter()
+            process = subprocess.Popen(
                 cmd,
-                capture_output=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
                 text=False,  # Get bytes to handle encoding issues properly
-                timeout=30,  # 30 second timeout
-                check=False,  # Don't raise exception on non-zero return code
             )
+            inference_start = time.perf_counter()
 
-            if result.returncode != 0:
-                error_msg = f"Model execution failed with code {result.returncode}"
-                if result.stderr:
-                    error_msg += f": {result.stderr}"
+            try:
+                stdout, stderr = process.communicate(timeout=30)  # 30 second timeout
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.communicate()
+                raise
+            parse_start = time.perf_counter()
+
+            if process.returncode != 0:
+                error_msg = f"Model execution failed with code {process.returncode}"
+                if stderr:
+                    error_msg += f": {stderr}"
                 raise RuntimeError(error_msg)
 
-            # Extract transcription from stdout
-            transcription = self._parse_output(result.stdout)
-            return transcription
+            # Extract transcription from stdout, timings from both streams
+            result = self._parse_output(stdout, stderr)
+            result.timings.update(
+                spawn_ms=(inference_start - spawn_start) * 1000,
+                inference_ms=(parse_start - inference_start) * 1000,
+                parse_ms=(time.perf_counter() - parse_start) * 1000,
+            )
+            return result
 
         except subprocess.TimeoutExpired:
             raise RuntimeError("Model execution timed out")
         except Exception as e:
             raise RuntimeError(f"Model execution failed: {str(e)}")
 
-    def _parse_output(self, output: bytes) -> str:
+    def _parse_output(
+        self, output: bytes, log_output: bytes = b""
+    ) -> TranscriptionResult:
         """
         Parse model output to extract transcription.
 
+        The one-shot binary has no structured output, so each line is
+        classified once: llama.cpp log lines (`function_name: message` for
+        llama.cpp's own functions, and audio progress messages) are dropped
+        and mined for timings, and everything else is generated text.
+
         Args:
             output: Raw stdout from model as bytes
+            log_output: Raw stderr from model as bytes
 
         Returns:
-            Cleaned transcription text
+            Cleaned transcription text and per-stage timings
         """
-        # Decode bytes to string
-        try:
-            output_str = output.decode("utf-8", errors="replace")
-        except Exception:
-            output_str = str(output)
-
-        # The model output may contain various information
-        # We need to extract just the transcription
-        lines = output_str.strip().split("\n")
+        output_str = output.decode("utf-8", errors="replace")
+        log_str = log_output.decode("utf-8", errors="replace")
 
-        # Look for the actual transcription in the output
-        # This may need adjustment based on actual model output format
         transcription_lines = []
-        capturing = False
+        log_lines = [log_str]
 
-        for line in lines:
+        for line in output_str.splitlines():
             line = line.strip()
 
             # Skip empty lines
             if not line:
                 continue
 
-            # Skip model loading messages
-            if any(
-                keyword in line.lower()
-                for keyword in [
-                    "loading",
-                    "model",
-                    "load_gguf",
-                    "loaded",
-                    "tensors",
-                    "gguf",
-                    "encoding",
-                    "slice",
-                ]
-            ):
-                continue
-
-            # Skip timing/performance info
-            if "ms" in line or "tokens" in line or "speed" in line:
-                continue
-
-            # This should be the transcription
-            transcription_lines.append(line)
+            if _LOG_LINE.match(line):
+                log_lines.append(line)
+            else:
+                transcription_lines.append(line)
 
         # Join all transcription lines
-        transcription = " ".join(transcription_lines).strip()
+        transcription = self._clean_transcription(" ".join(transcription_lines))
 
-        # Clean up the transcription
-        transcription = self._clean_transcription(transcription)
+        logs = "\n".join(log_lines)
+        timings = {}
+        for name, pattern in _LOG_TIMINGS.items():
+            values = pattern.findall(logs)
+            if values:
+                timings[name] = sum(float(value) for value in values)
 
-        return transcription
+        return TranscriptionResult(text=transcription, timings=timings)
 
     def _clean_transcription(self, text: str) -> str:
         """
@@ -148,31 +299,14 @@ class LFM2AudioWrapper:
         Returns:
             Cleaned transcription
         """
-        # Remove extra whitespace
-        text = " ".join(text.split())
-
-        # Remove common artifacts that might appear in output
-        artifacts = [
-            "Perform ASR.",
-            "[INST]",
-            "[/INST]",
-            "<s>",
-            "</s>",
-            "System:",
-            "User:",
-            "Assistant:",
-            "load_gguf:",
-            "Loaded",
-            "tensors",
-            "encoding audio slice...",
-        ]
-
-        for artifact in artifacts:
-            text = text.replace(artifact, "")
-
-        return text.strip()
-
-    def transcribe_audio_data(self, audio_data, sample_rate: int = 48000) -> str:
+        # Remove chat-template artifacts and the echoed prompt in one pass,
+        # then collapse whitespace
+        text = _ARTIFACTS.sub(" ", text)
+        return " ".join(text.split())
+
+    def transcribe_audio_data(
+        self, audio_data, sample_rate: int = MODEL_SAMPLE_RATE
+    ) -> str:
         """
         Transcribe audio data (numpy array) to text.
 
@@ -183,16 +317,45 @@ class LFM2AudioWrapper:
         Returns:
             Transcribed text
         """
+        return self.transcribe_audio_data_detailed(audio_data, sample_rate).text
+
+    def transcribe_audio_data_detailed(
+        self, audio_data, sample_rate: int = MODEL_SAMPLE_RATE
+    ) -> TranscriptionResult:
+        """
+        Transcribe audio data (numpy array), keeping the runner timings.
+
+        Args:
+            audio_data: Audio data as numpy array
+            sample_rate: Sample rate of audio data
+
+        Returns:
+            Transcribed text and per-stage timings
+        """
         # Import here to avoid circular imports
-        from .audio_preprocessing import save_raw_audio_as_wav
+        from .audio_preprocessing import encode_wav_bytes, save_raw_audio_as_wav
+
+        # The resident server takes the WAV over HTTP, no temporary file needed
+        self.start()
+        if self._worker:
+            write_start = time.perf_counter()
+            wav_bytes = encode_wav_bytes(audio_data, sample_rate)
+            write_ms = (time.perf_counter() - write_start) * 1000
+
+            result = self._worker.transcribe_wav_bytes(wav_bytes)
+            result.timings["write_ms"] = write_ms
+            return result
 
         # Save audio data to temporary file
+        write_start = time.perf_counter()
         temp_file = save_raw_audio_as_wav(audio_data, sample_rate)
+        write_ms = (time.perf_counter() - write_start) * 1000
 
         try:
             # Transcribe the temporary file
-            transcription = self.transcribe_audio_file(temp_file)
-            return transcription
+            result = self.transcribe_audio_file_detailed(temp_file)
+            result.timings["write_ms"] = write_ms
+            return result
         finally:
             # Clean up temporary file
             try:
@@ -232,6 +395,65 @@ class LFM2AudioWrapper:
             print(f"❌ Model test failed: {e}")
             return False
 
+    def transcribe_offline(
+        self,
+        audio_file_path: str | Path,
+        chunk_duration: float = 2.0,
+        overlap: float = 0.5,
+        num_workers: int | None = None,
+        chunk_strategy: str = "fixed",
+        vad: EnergyVAD | None = None,
+    ) -> tuple[str, int]:
+        """
+        Transcribe audio file as fast as possible, without real-time pacing.
+
+        Args:
+            audio_file_path: Path to audio file
+            chunk_duration: Duration of each chunk in seconds
+            overlap: Overlap between chunks in seconds
+            num_workers: Number of concurrent inference workers
+                (defaults to config.num_workers)
+            chunk_strategy: "fixed" windows or "vad" to skip silence
+            vad: Voice activity detector for the "vad" strategy
+                (defaults to EnergyVAD())
+
+        Returns:
+            Tuple of (transcription, number_of_chunks)
+        """
+        audio_path = str(audio_file_path)
+
+        # Verify input file exists
+        if not os.path.exists(audio_path):
+            raise FileNotFoundError(f"Audio file not found: {audio_path}")
+
+        num_workers = max(1, num_workers or self.config.num_workers)
+        chunker = AudioChunker(
+            chunk_duration=chunk_duration,
+            overlap=overlap,
+            strategy=chunk_strategy,
+            vad=vad,
+        )
+        audio_data, sample_rate = chunker.load_audio(audio_path)
+
+        self.start()
+
+        with ThreadPoolExecutor(
+            max_workers=num_workers, thread_name_prefix="asr-worker"
+        ) as executor:
+            # executor.map keeps results in chunk order
+            chunk_transcriptions = list(
+                executor.map(
+                    lambda chunk: self.transcribe_audio_data(chunk[0], sample_rate),
+                    chunker.iter_windows(audio_data, sample_rate),
+                )
+            )
+
+        stitcher = TranscriptStitcher()
+        for chunk_transcription in chunk_transcriptions:
+            stitcher.add(chunk_transcription)
+
+        return stitcher.text, len(chunk_transcriptions)
+
     def transcribe_with_real_timing(
         self,
         audio_file_path: str | Path,
@@ -241,10 +463,16 @@ class LFM2AudioWrapper:
         clean_text: bool = False,
         log_partial_transcripts: str | None = None,
         typewriter_effect: bool = False,
+        num_workers: int | None = None,
+        chunk_strategy: str = "fixed",
+        metrics: LatencyMetrics | None = None,
     ) -> str:
         """
         Transcribe audio file with real-time processing that respects actual speech timing.
 
+        Chunks are dispatched to a bounded pool of inference workers as their
+        wall-clock start time arrives, and results are displayed in chunk order.
+
         Args:
             audio_file_path: Path to audio file
             chunk_duration: Duration of each chunk in seconds
@@ -253,21 +481,34 @@ class LFM2AudioWrapper:
             clean_text: Whether to clean transcription with language model
             log_partial_transcripts: CSV file path to log incremental transcriptions
             typewriter_effect: Whether to display text with typewriter effect
+            num_workers: Number of concurrent inference workers
+                (defaults to config.num_workers)
+            chunk_strategy: "fixed" windows or "vad" to skip silence and cut
+                chunks at pauses
+            metrics: Collector for per-chunk stage latencies
 
         Returns:
             Complete transcription (cleaned if clean_text=True)
         """
         audio_path = str(audio_file_path)
+        num_workers = max(1, num_workers or self.config.num_workers)
 
         # Verify input file exists
         if not os.path.exists(audio_path):
             raise FileNotFoundError(f"Audio file not found: {audio_path}")
 
         # Initialize chunker
-        chunker = AudioChunker(chunk_duration=chunk_duration, overlap=overlap)
+        chunker = AudioChunker(
+            chunk_duration=chunk_duration, overlap=overlap, strategy=chunk_strategy
+        )
 
-        # Get audio info
-        total_duration, _, _ = chunker.get_audio_info(audio_path)
+        # Decode once; chunks are views into the model's copy of the buffer,
+        # while playback keeps the source rate and channels
+        source_data, source_rate = sf.read(audio_path, dtype="float32")
+        audio_data, sample_rate = chunker.prepare_audio(source_data, source_rate)
+        playback = (source_data, source_rate) if play_audio else None
+        del source_data  # Only playback needs the source buffer
+        total_duration = len(audio_data) / sample_rate
 
         print(f"🎵 Starting real-time transcription of {audio_path}")
         print(f"📊 Duration: {total_duration:.1f}s | Chunk size: {chunk_duration}s")
@@ -277,8 +518,7 @@ class LFM2AudioWrapper:
 
         raw_transcription_parts = []  # Store raw chunks for context
         already_displayed_parts = []  # Track what's shown on console
-        chunk_files_to_cleanup = []
-        cleaning_line_count = 0  # Track console lines used for cleaning output
+        stitcher = TranscriptStitcher()  # Drops words repeated in chunk overlaps
 
         # Initialize text cleaner BEFORE audio to minimize delay
         text_cleaner = None
@@ -311,87 +551,97 @@ class LFM2AudioWrapper:
                 print(f"⚠️ Raw transcript logger initialization failed: {e}")
                 raw_transcript_logger = None
 
-        # Initialize audio player AFTER models are ready
-        audio_player = None
-        if play_audio:
-            from .audio_playback import create_audio_player
+        # Load the ASR models once, before timing starts
+        self.start()
 
-            audio_player = create_audio_player(audio_path)
+        # Play the already decoded source; its position drives the clock that
+        # schedules chunks, so timings are relative to what the user hears
+        audio_player = None
+        if playback:
+            audio_player = create_audio_player(*playback)
             if audio_player:
                 print("🔊 Starting audio playback...")
-                audio_player.start_playback()
-
-        # Start timing after all initialization is complete
-        start_time = time.time()
-
-        # Process all chunks in unified loop
-        for chunk_path, chunk_start, chunk_end in chunker.create_chunks(audio_path):
-            chunk_files_to_cleanup.append(chunk_path)
+        clock = MediaClock(audio_player)
+
+        # Render the typewriter effect on its own thread so it never delays
+        # the next chunk
+        typewriter = None
+        if typewriter_effect:
+            typewriter = TypewriterDisplay(
+                speed=self.config.typewriter_speed,
+                respect_words=self.config.typewriter_respect_words,
+            )
+            typewriter.start()
 
-            # Calculate when this chunk should be processed (real-time simulation)
-            expected_time = start_time + chunk_start
-            current_time = time.time()
+        def display(new_content: str) -> None:
+            """Append new content to the console."""
+            if typewriter:
+                typewriter.write(" " + new_content)
+            else:
+                # Standard immediate display
+                print(" " + new_content, end="", flush=True)
+            already_displayed_parts.append(new_content)
 
-            # Wait if we're processing too fast (maintain real-time pace)
-            if current_time < expected_time:
-                wait_time = expected_time - current_time
-                time.sleep(wait_time)
+        # Clean only the newest words, off the transcription path
+        incremental_cleaner = None
+        if text_cleaner:
+            from .text_cleaner import IncrementalTextCleaner
 
-            # Process chunk
-            # breakpoint()
-            chunk_transcription = self.transcribe_audio_file(chunk_path)
+            incremental_cleaner = IncrementalTextCleaner(text_cleaner, display)
+            incremental_cleaner.start()
 
+        # Start timing after all initialization is complete
+        start_time = time.time()
+        clock.start()
+
+        def handle_transcription(
+            chunk_transcription: str,
+            chunk_index: int,
+            chunk_start: float,
+            chunk_end: float,
+        ) -> None:
+            """Log, clean and display one chunk transcription, in chunk order."""
             # Log incremental transcription if logger is available
             if raw_transcript_logger and chunk_transcription.strip():
-                raw_transcript_logger.log_incremental_chunk(chunk_transcription)
+                raw_transcript_logger.log_incremental_chunk(
+                    chunk_transcription, chunk_index, chunk_start, chunk_end
+                )
 
             if chunk_transcription.strip():
                 # Accumulate raw transcription for context
                 raw_transcription_parts.append(chunk_transcription)
 
-                # Clean with context of last 2 chunks + current if text cleaner available
-                new_content = ""
-                if text_cleaner:
-                    raise Exception("Not implemented yet")
-
-                    # Use context window: last 2 chunks + current chunk
-                    if len(raw_transcription_parts) >= 3:
-                        context_chunks = raw_transcription_parts[-3:]
-                    else:
-                        context_chunks = raw_transcription_parts
-
-                    context_text = " ".join(context_chunks)
-                    cleaned_context = text_cleaner.clean_text(context_text)
+                # Emit the words not already in the overlap
+                new_content = stitcher.add(chunk_transcription)
+                if not new_content:
+                    return
 
-                    # Extract only new content
-                    new_content = self._extract_new_content(
-                        cleaned_context, already_displayed_parts, chunk_transcription
-                    )
+                if incremental_cleaner:
+                    incremental_cleaner.submit(new_content)
                 else:
-                    # No text cleaner - use raw chunk
-                    new_content = chunk_transcription
-
-                # Append new content to console if we have any
-                if new_content:
-                    if typewriter_effect:
-                        # Use typewriter effect for displaying new content
-                        self._typewriter_display(
-                            " " + new_content,
-                            speed=self.config.typewriter_speed,
-                            respect_words=self.config.typewriter_respect_words,
-                        )
-                    else:
-                        # Standard immediate display
-                        print(" " + new_content, end="", flush=True)
-                    already_displayed_parts.append(new_content)
-
-        # Stop audio playback
-        if audio_player:
-            audio_player.stop_playback()
-
-        # Clean up chunk files
-        for chunk_file in chunk_files_to_cleanup:
-            os.unlink(chunk_file)
+                    display(new_content)
+
+        try:
+            self._transcribe_windows(
+                chunker.iter_windows(audio_data, sample_rate),
+                sample_rate,
+                handle_transcription,
+                clock,
+                num_workers=num_workers,
+                metrics=metrics,
+            )
+        finally:
+            # Let the cleaner finish whatever is still queued
+            if incremental_cleaner:
+                incremental_cleaner.close()
+            if typewriter:
+                typewriter.close()
+            # Write the buffered partial transcripts
+            if raw_transcript_logger:
+                raw_transcript_logger.close()
+            # Stop audio playback, also when transcription fails
+            if audio_player:
+                audio_player.stop_playback()
 
         # Get final transcription from displayed parts or raw parts as fallback
         full_transcription = (
@@ -403,55 +653,176 @@ class LFM2AudioWrapper:
         print(f"✅ Complete transcription ({time.time() - start_time:.1f}s):")
         print(f"📄 {full_transcription}")
 
+        if metrics:
+            metrics.print_summary()
+
         return full_transcription
 
-    def _typewriter_display(
-        self, text: str, speed: float = 0.05, respect_words: bool = True
-    ) -> None:
+    def transcribe_microphone(
+        self,
+        max_duration: float | None = None,
+        chunk_duration: float = 2.0,
+        overlap: float = 0.5,
+        num_workers: int | None = None,
+        metrics: LatencyMetrics | None = None,
+    ) -> str:
         """
-        Display text with typewriter effect - character by character.
+        Transcribe live microphone audio until stopped or `max_duration` elapses.
+
+        Capture runs on PyAudio's callback thread and writes into a ring
+        buffer; each window is copied out of it as soon as it is complete, so
+        a slow chunk cannot be overwritten while it waits for a worker.
 
         Args:
-            text: Text to display
-            speed: Seconds per character
-            respect_words: Whether to pause slightly at word boundaries
+            max_duration: Seconds of audio to transcribe (None for Ctrl+C)
+            chunk_duration: Duration of each chunk in seconds
+            overlap: Overlap between chunks in seconds
+            num_workers: Number of concurrent inference workers
+                (defaults to config.num_workers)
+            metrics: Collector for per-chunk stage latencies
+
+        Returns:
+            Complete transcription
         """
-        if not text:
-            return
+        from .microphone import MicrophoneStream
+
+        num_workers = max(1, num_workers or self.config.num_workers)
+        stitcher = TranscriptStitcher()
+
+        def handle_transcription(chunk_transcription: str, *_) -> None:
+            new_content = stitcher.add(chunk_transcription)
+            if new_content:
+                print(" " + new_content, end="", flush=True)
+
+        # Load the ASR models once, before capture starts
+        self.start()
+
+        microphone = MicrophoneStream(
+            sample_rate=self.config.sample_rate,
+            channels=self.config.channels,
+            frames_per_buffer=self.config.chunk_size,
+            buffer_seconds=self.config.ring_buffer_seconds,
+        )
+
+        print("🎙️  Listening... (Ctrl+C to stop)")
+        print("-" * 60)
+        print("📝 ", end="", flush=True)  # Start the line
+
+        start_time = time.time()
+        clock = MediaClock()  # Window times are relative to capture start
+        try:
+            with microphone:
+                clock.start()
+                windows = microphone.iter_windows(chunk_duration, overlap, max_duration)
+                self._transcribe_windows(
+                    # Copy: ring buffer views are overwritten while queued
+                    ((np.array(chunk), start, end) for chunk, start, end in windows),
+                    microphone.sample_rate,
+                    handle_transcription,
+                    clock,
+                    num_workers=num_workers,
+                    metrics=metrics,
+                )
+        except KeyboardInterrupt:
+            pass
+
+        print(f"\n{'-' * 60}")
+        print(f"✅ Complete transcription ({time.time() - start_time:.1f}s):")
+        print(f"📄 {stitcher.text}")
+
+        if metrics:
+            metrics.print_summary()
+
+        return stitcher.text
 
-        words = text.split() if respect_words else [text]
+    def _transcribe_windows(
+        self,
+        windows: Iterable[tuple[np.ndarray, float, float]],
+        sample_rate: int,
+        on_transcription: Callable[[str, int, float, float], None],
+        clock: MediaClock,
+        num_workers: int,
+        metrics: LatencyMetrics | None = None,
+    ) -> None:
+        """
+        Transcribe a stream of audio windows with a bounded worker pool.
 
-        for i, word in enumerate(words):
-            # Add space before word (except first)
-            if i > 0:
-                print(" ", end="", flush=True)
-                time.sleep(speed * 0.5)  # Shorter pause for spaces
+        Args:
+            windows: Iterable of (audio_chunk, start_time, end_time)
+            sample_rate: Sample rate of the audio chunks
+            on_transcription: Called with each chunk transcription, in order,
+                along with the chunk's index, start and end times
+            clock: Media clock the window times refer to. Each chunk is
+                dispatched once the clock has passed its end, i.e. once its
+                audio has been heard or, for a microphone, captured.
+            num_workers: Number of concurrent inference workers
+            metrics: Collector for per-chunk stage latencies
+        """
 
-            # Display each character in the word
-            for char in word:
-                print(char, end="", flush=True)
-                time.sleep(speed)
+        def infer_chunk(audio_chunk, chunk_end: float) -> TranscriptionResult:
+            """Transcribe one chunk on a worker thread."""
+            queue_lag_ms = (clock.time() - chunk_end) * 1000
+            result = self.transcribe_audio_data_detailed(audio_chunk, sample_rate)
+            result.timings["queue_lag_ms"] = queue_lag_ms
+            return result
+
+        # Chunks in flight, oldest first, as (index, start, end, future).
+        # Results are consumed from the left so output stays in chunk order
+        # whatever order inference finishes in.
+        pending: deque[tuple[int, float, float, Future[TranscriptionResult]]] = deque()
+
+        def emit_oldest() -> None:
+            """Hand the oldest chunk's text on, recording its latencies."""
+            chunk_index, chunk_start, chunk_end, future = pending.popleft()
+            result = future.result()
+            if metrics:
+                # From hearing the end of the chunk to seeing its caption
+                result.timings["caption_latency_ms"] = (clock.time() - chunk_end) * 1000
+                metrics.record(chunk_index, chunk_start, result.timings)
+            on_transcription(result.text, chunk_index, chunk_start, chunk_end)
+
+        with ThreadPoolExecutor(
+            max_workers=num_workers, thread_name_prefix="asr-worker"
+        ) as executor:
+            for chunk_index, (audio_chunk, chunk_start, chunk_end) in enumerate(
+                windows
+            ):
+                # Backpressure: with every worker busy, wait for the oldest
+                # chunk instead of queueing more audio behind it
+                while len(pending) >= num_workers:
+                    emit_oldest()
+
+                # Wait until the chunk has been heard (maintain real-time
+                # pace), displaying finished chunks in the meantime
+                while (wait_time := chunk_end - clock.time()) > 0:
+                    if not pending:
+                        time.sleep(wait_time)
+                        continue
+                    try:
+                        pending[0][3].result(timeout=wait_time)
+                    except FutureTimeoutError:
+                        continue
+                    emit_oldest()
+
+                # Display chunks that finished while the next one was captured
+                while pending and pending[0][3].done():
+                    emit_oldest()
+
+                # Chunk N+1 is submitted while chunk N is still being inferred
+                pending.append(
+                    (
+                        chunk_index,
+                        chunk_start,
+                        chunk_end,
+                        executor.submit(infer_chunk, audio_chunk, chunk_end),
+                    )
+                )
 
-            # Small pause at word boundaries if enabled
-            if respect_words and i < len(words) - 1:
-                time.sleep(speed * 1.5)
+            # Drain the remaining chunks in order
+            while pending:
+                emit_oldest()
 
     def _clear_console_lines(self, line_count: int) -> None:
         """Clear previous console output lines."""
         for _ in range(line_count):
             print("\033[A\033[K", end="")  # Move up one line and clear it
-
-    def _extract_new_content(
-        self, cleaned_text: str, displayed_parts: list, raw_chunk: str = ""
-    ) -> str:
-        """Extract only new content from cleaned text."""
-        if not displayed_parts:
-            return cleaned_text
-
-        existing_text = " ".join(displayed_parts)
-        if cleaned_text.startswith(existing_text.strip()):
-            new_content = cleaned_text[len(existing_text) :].strip()
-            return new_content
-        else:
-            # Fallback: use raw chunk if cleaning changed too much
-            return raw_chunk
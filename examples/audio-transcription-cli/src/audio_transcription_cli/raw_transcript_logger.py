@@ -1,39 +1,130 @@
 """Raw transcript logger for incremental chunk transcription logging."""
 
 import csv
+import queue
+import threading
+import time
+from datetime import datetime
 from pathlib import Path
 
 
 class RawTranscriptLogger:
-    """Logger for incremental concatenation of chunk transcriptions."""
+    """
+    Logger for incremental chunk transcriptions.
 
-    def __init__(self, csv_path: str):
+    Only the new chunk is written, together with its index, its position in
+    the audio and the time it was logged, so the file grows linearly with
+    the session. Rows are written by a background thread and flushed every
+    `flush_interval` seconds, so logging never blocks transcription. Use
+    `read_cumulative` to rebuild the transcript as it stood after each chunk.
+    """
+
+    FIELDS = [
+        "chunk_index",
+        "chunk_start_s",
+        "chunk_end_s",
+        "timestamp",
+        "elapsed_s",
+        "text",
+    ]
+
+    def __init__(self, csv_path: str, flush_interval: float = 1.0):
         """
-        Initialize the raw transcript logger.
+        Initialize the raw transcript logger and start its writer thread.
+
+        The file is opened here, so that an unwritable path raises to the
+        caller instead of failing silently in the writer thread.
 
         Args:
             csv_path: Path to the CSV file where transcriptions will be logged
+            flush_interval: Seconds between flushes to disk
         """
         self.csv_path = Path(csv_path)
-        self.accumulated_text: list[str] = []
+        self.flush_interval = flush_interval
+        self._start_time = time.time()
+        self._file = open(self.csv_path, "a", newline="", encoding="utf-8")
+        self._csv_writer = csv.writer(self._file)
+        if self._file.tell() == 0:
+            self._csv_writer.writerow(self.FIELDS)
+        self._queue: queue.SimpleQueue[list | None] = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._writer, daemon=True)
+        self._thread.start()
 
-    def log_incremental_chunk(self, new_chunk: str) -> None:
+    def log_incremental_chunk(
+        self, new_chunk: str, chunk_index: int, chunk_start: float, chunk_end: float
+    ) -> None:
         """
-        Log a new chunk as part of incremental concatenation.
-
-        Each call adds the new chunk to the accumulated text and logs the
-        concatenation of all chunks processed so far.
+        Queue a new chunk for logging. Returns immediately.
 
         Args:
             new_chunk: The new chunk transcription to add
+            chunk_index: Position of the chunk in the audio
+            chunk_start: Start of the chunk in the audio, in seconds
+            chunk_end: End of the chunk in the audio, in seconds
+        """
+        now = time.time()
+        self._queue.put(
+            [
+                chunk_index,
+                f"{chunk_start:.3f}",
+                f"{chunk_end:.3f}",
+                datetime.fromtimestamp(now).isoformat(timespec="milliseconds"),
+                f"{now - self._start_time:.3f}",
+                new_chunk,
+            ]
+        )
+
+    def close(self) -> None:
+        """Write every queued chunk and stop the writer thread."""
+        if not self._thread.is_alive():
+            return
+
+        self._queue.put(None)
+        self._thread.join()
+
+    def _writer(self) -> None:
+        """Append queued rows to the CSV, flushing on an interval."""
+        with self._file as f:
+            last_flush = time.monotonic()
+            while True:
+                try:
+                    row = self._queue.get(timeout=self.flush_interval)
+                except queue.Empty:
+                    row = []  # Nothing new; just flush below
+
+                if row is None:
+                    break
+                if row:
+                    self._csv_writer.writerow(row)
+
+                if time.monotonic() - last_flush >= self.flush_interval:
+                    f.flush()
+                    last_flush = time.monotonic()
+
+    @classmethod
+    def read_cumulative(cls, csv_path: str) -> list[str]:
+        """
+        Rebuild the concatenated transcript after each logged chunk.
+
+        Args:
+            csv_path: CSV file written by a RawTranscriptLogger
+
+        Returns:
+            The transcript so far, one entry per chunk
         """
-        # Add new chunk to our running list
-        self.accumulated_text.append(new_chunk)
+        cumulative = []
+        parts: list[str] = []
+        with open(csv_path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                parts.append(row["text"])
+                cumulative.append(" ".join(parts))
+
+        return cumulative
 
-        # Create concatenated text of all chunks so far
-        full_text = " ".join(self.accumulated_text)
+    def __enter__(self):
+        """Context manager entry."""
+        return self
 
-        # Write to CSV
-        with open(self.csv_path, "a", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow([full_text])
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit with cleanup."""
+        self.close()
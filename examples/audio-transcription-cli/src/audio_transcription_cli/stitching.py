@@ -0,0 +1,117 @@
+"""Overlap-aware stitching of chunk transcriptions into one transcript."""
+
+import re
+
+_NON_WORD = re.compile(r"[^\w']+")
+
+
+def _normalize(word: str) -> str:
+    """Lowercase a word and strip punctuation for comparison."""
+    return _NON_WORD.sub("", word.lower())
+
+
+def _lcs_pairs(a: list[str], b: list[str]) -> list[tuple[int, int]]:
+    """
+    Align two token sequences with a longest common subsequence.
+
+    Args:
+        a: First token sequence
+        b: Second token sequence
+
+    Returns:
+        Matched (index_in_a, index_in_b) pairs, in increasing order
+    """
+    n, m = len(a), len(b)
+
+    # lengths[i][j] = LCS length of a[i:] and b[j:]
+    lengths = [[0] * (m + 1) for _ in range(n + 1)]
+    for i in range(n - 1, -1, -1):
+        for j in range(m - 1, -1, -1):
+            if a[i] and a[i] == b[j]:
+                lengths[i][j] = lengths[i + 1][j + 1] + 1
+            else:
+                lengths[i][j] = max(lengths[i + 1][j], lengths[i][j + 1])
+
+    # Walk the table, skipping a match in `a` whenever the same LCS length is
+    # still reachable further on, so matches sit as late in `a` and as early
+    # in `b` as possible
+    pairs = []
+    i = j = 0
+    while i < n and j < m:
+        if a[i] and a[i] == b[j] and lengths[i + 1][j] < lengths[i][j]:
+            pairs.append((i, j))
+            i += 1
+            j += 1
+        elif lengths[i + 1][j] >= lengths[i][j + 1]:
+            i += 1
+        else:
+            j += 1
+
+    return pairs
+
+
+class TranscriptStitcher:
+    """Merges transcriptions of overlapping chunks, emitting only new words."""
+
+    def __init__(self, max_overlap_words: int = 8, anchor_slack: int = 1):
+        """
+        Initialize the stitcher.
+
+        Args:
+            max_overlap_words: Number of words compared at the end of the
+                transcript and the start of each new chunk. Should comfortably
+                cover the words spoken during the chunk overlap.
+            anchor_slack: How many words the alignment may skip at the edges,
+                to tolerate a word cut in half at a chunk boundary
+        """
+        self.max_overlap_words = max_overlap_words
+        self.anchor_slack = anchor_slack
+        self.words: list[str] = []
+
+    @property
+    def text(self) -> str:
+        """The stitched transcript so far."""
+        return " ".join(self.words)
+
+    def add(self, chunk_transcription: str) -> str:
+        """
+        Append a chunk transcription, dropping words already in the transcript.
+
+        The tail of the transcript is aligned with the head of the new chunk.
+        The alignment is only trusted when it is anchored at both edges, i.e.
+        it reaches the end of the tail and starts at the beginning of the head,
+        and at least half of the words in the matched span agree.
+
+        Args:
+            chunk_transcription: Transcription of the newest chunk
+
+        Returns:
+            The new words, or an empty string if the chunk adds nothing
+        """
+        new_words = chunk_transcription.split()
+        if not new_words:
+            return ""
+
+        cut = 0
+        if self.words:
+            tail = [_normalize(w) for w in self.words[-self.max_overlap_words :]]
+            head = [_normalize(w) for w in new_words[: self.max_overlap_words]]
+            pairs = _lcs_pairs(tail, head)
+
+            if pairs:
+                (_, first_head), (last_tail, last_head) = pairs[0], pairs[-1]
+                anchored = (
+                    last_tail >= len(tail) - 1 - self.anchor_slack
+                    and first_head <= self.anchor_slack
+                )
+                dense = len(pairs) * 2 >= last_head - first_head + 1
+                if anchored and dense:
+                    cut = last_head + 1
+
+        emitted = new_words[cut:]
+        self.words.extend(emitted)
+        return " ".join(emitted)
+
+    def reset(self) -> None:
+        """Forget the transcript so far."""
+        self.words.clear()
@@ -0,0 +1,200 @@
+"""Sweep chunking settings over a reference corpus to trade latency for accuracy."""
+
+import csv
+import itertools
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import NamedTuple
+
+import soundfile as sf
+
+from . import batch
+from .config import Config
+from .vad import EnergyVAD
+from .wer import normalize_words, word_error_rate
+
+
+class SweepSetting(NamedTuple):
+    """One chunking setting. Fields that do not apply to the strategy are None."""
+
+    chunk_duration: float
+    overlap: float | None
+    chunk_strategy: str
+    noise_margin_db: float | None
+    min_silence_duration: float | None
+
+
+def _evaluate_file(setting: SweepSetting, audio_file: Path, reference: str) -> dict:
+    """Transcribe one file with one chunking setting and score it."""
+    vad = None
+    if setting.chunk_strategy == "vad":
+        vad = EnergyVAD(
+            noise_margin_db=setting.noise_margin_db,
+            min_silence_duration=setting.min_silence_duration,
+        )
+
+    start = time.time()
+    # The model is loaded once per pool process by `batch._init_worker`
+    transcription, num_chunks = batch._worker_model.transcribe_offline(
+        audio_file,
+        chunk_duration=setting.chunk_duration,
+        overlap=setting.overlap or 0.0,
+        chunk_strategy=setting.chunk_strategy,
+        vad=vad,
+    )
+    num_words = len(normalize_words(reference))
+
+    return {
+        "elapsed_s": time.time() - start,
+        "audio_s": sf.info(str(audio_file)).duration,
+        "chunks": num_chunks,
+        "word_errors": word_error_rate(reference, transcription) * num_words,
+        "reference_words": num_words,
+    }
+
+
+def run_sweep(
+    references: list[tuple[Path, str]],
+    config: Config,
+    chunk_durations: list[float],
+    overlaps: list[float],
+    chunk_strategies: list[str],
+    output_path: str,
+    jobs: int = 2,
+    noise_margins_db: list[float] | None = None,
+    min_silence_durations: list[float] | None = None,
+) -> list[dict]:
+    """
+    Evaluate every combination of chunking settings on a reference corpus.
+
+    Every (setting, file) pair is an independent task, fanned out across
+    `jobs` processes that each hold their own copy of the model.
+
+    Args:
+        references: List of (audio_path, reference_transcript)
+        config: Configuration object
+        chunk_durations: Chunk durations to try, in seconds
+        overlaps: Overlaps to try, in seconds (skipped if >= the duration).
+            "vad" cuts at pauses and ignores overlap, so it runs once per
+            duration and VAD setting with the overlap reported as None
+        chunk_strategies: Chunking strategies to try ("fixed", "vad")
+        output_path: CSV file to write the comparison table to
+        jobs: Number of worker processes
+        noise_margins_db: EnergyVAD noise margins to try with "vad"
+            (defaults to the EnergyVAD default)
+        min_silence_durations: EnergyVAD minimum pause lengths to try with
+            "vad", in seconds (defaults to the EnergyVAD default)
+
+    Returns:
+        One row per setting with its WER, real-time factor and chunk count.
+        A setting whose every run failed is reported with WER and real-time
+        factor None.
+    """
+    default_vad = EnergyVAD()
+    noise_margins_db = noise_margins_db or [default_vad.noise_margin_db]
+    min_silence_durations = min_silence_durations or [default_vad.min_silence_duration]
+
+    settings = []
+    for duration, strategy in itertools.product(chunk_durations, chunk_strategies):
+        if strategy == "vad":
+            settings += [
+                SweepSetting(duration, None, strategy, margin, silence)
+                for margin, silence in itertools.product(
+                    noise_margins_db, min_silence_durations
+                )
+            ]
+        else:
+            settings += [
+                SweepSetting(duration, overlap, strategy, None, None)
+                for overlap in overlaps
+                if overlap < duration
+            ]
+    settings = list(dict.fromkeys(settings))
+    if not settings or not references:
+        print("❌ Nothing to evaluate")
+        return []
+
+    num_tasks = len(settings) * len(references)
+    print(
+        f"🧪 Evaluating {len(settings)} settings on {len(references)} files "
+        f"({num_tasks} runs, {jobs} processes)"
+    )
+
+    totals = defaultdict(lambda: defaultdict(float))
+    with ProcessPoolExecutor(
+        max_workers=jobs, initializer=batch._init_worker, initargs=(config,)
+    ) as executor:
+        futures = {
+            executor.submit(_evaluate_file, setting, audio_file, reference): setting
+            for setting in settings
+            for audio_file, reference in references
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            setting = futures[future]
+            try:
+                for key, value in future.result().items():
+                    totals[setting][key] += value
+            except Exception as e:
+                totals[setting]["errors"] += 1
+                print(f"❌ {setting}: {e}")
+            print(f"⏳ {done}/{num_tasks} runs done", end="\r", flush=True)
+
+    rows = []
+    for setting in settings:
+        t = totals[setting]
+        # Every run of the setting failed: report it rather than drop it
+        failed = t["reference_words"] == 0
+        rows.append(
+            {
+                "chunk_duration": setting.chunk_duration,
+                "overlap": setting.overlap,
+                "chunking": setting.chunk_strategy,
+                "noise_margin_db": setting.noise_margin_db,
+                "min_silence_s": setting.min_silence_duration,
+                "wer": None
+                if failed
+                else round(t["word_errors"] / t["reference_words"], 4),
+                "real_time_factor": None
+                if failed
+                else round(t["elapsed_s"] / t["audio_s"], 4),
+                "chunks": int(t["chunks"]),
+                "errors": int(t["errors"]),
+            }
+        )
+
+    if rows:
+        with open(output_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+        print(f"\n📊 Comparison table written to {output_path}")
+
+    print_sweep_table(rows)
+    return rows
+
+
+def print_sweep_table(rows: list[dict]) -> None:
+    """Print the settings from most to least accurate, failed ones last."""
+
+    def optional(value: float | None, spec: str) -> str:
+        return "-" if value is None else format(value, spec)
+
+    print(
+        f"\n{'chunk s':>8}{'overlap s':>10}{'chunking':>10}{'margin dB':>10}"
+        f"{'pause s':>8}{'WER':>8}{'RTF':>8}{'chunks':>8}"
+    )
+    for r in sorted(
+        rows,
+        key=lambda r: (r["wer"] is None, r["wer"] or 0, r["real_time_factor"] or 0),
+    ):
+        if r["wer"] is None:
+            scores = f"{'failed':>16}"
+        else:
+            scores = f"{r['wer']:>8.1%}{r['real_time_factor']:>8.3f}"
+        print(
+            f"{r['chunk_duration']:>8.2f}{optional(r['overlap'], '.2f'):>10}"
+            f"{r['chunking']:>10}{optional(r['noise_margin_db'], '.1f'):>10}"
+            f"{optional(r['min_silence_s'], '.2f'):>8}{scores}{r['chunks']:>8}"
+        )
@@ -1,6 +1,9 @@
 """Text cleaning module for post-processing transcriptions."""
 
+import queue
+import threading
 import time
+from collections.abc import Callable
 
 from llama_cpp import Llama
 
@@ -20,6 +23,10 @@ class TextCleaner:
         self.config = config
         self._llama: Llama | None = None
         self._model_loaded = False
+        # KV state right after the system prompt, restored before every call
+        self._prefix_state = None
+        # llama.cpp contexts are not thread-safe
+        self._lock = threading.Lock()
 
         # Validate text cleaner model exists
         if not self.config.text_cleaner_model_path.exists():
@@ -40,8 +47,11 @@ class TextCleaner:
         try:
             print("🧹 Loading text cleaning model...")
             self._llama = Llama(
-                model_path=str(self.config.text_cleaner_model_path), verbose=False
+                model_path=str(self.config.text_cleaner_model_path),
+                n_ctx=self.config.text_cleaning_max_tokens,
+                verbose=False,
             )
+            self._cache_system_prompt()
 
             self._model_loaded = True
             print("✅ Text cleaning model loaded successfully")
@@ -78,18 +88,20 @@ class TextCleaner:
             # Generate cleaned text
             start_time = time.time()
 
-            # Reset model state if available
-            if hasattr(self._llama, "reset"):
-                self._llama.reset()
-
-            response = self._llama.create_chat_completion(
-                messages=messages,
-                # TODO: extract these parameters to config
-                temperature=0.1,
-                min_p=0.15,
-                repeat_penalty=1.05,
-                max_tokens=512,
-            )
+            with self._lock:
+                # Start from the cached system prompt; llama-cpp-python then
+                # only evaluates the tokens after the common prefix
+                if self._prefix_state is not None:
+                    self._llama.load_state(self._prefix_state)
+
+                response = self._llama.create_chat_completion(
+                    messages=messages,
+                    # TODO: extract these parameters to config
+                    temperature=0.1,
+                    min_p=0.15,
+                    repeat_penalty=1.05,
+                    max_tokens=512,
+                )
 
             # response = self._llama.create_chat_completion(messages=messages, temperature=0.1, min_p=0.15, repeat_penalty=1.05)
 
@@ -106,6 +118,22 @@ class TextCleaner:
             print("📝 Falling back to raw transcription")
             return raw_text
 
+    def _cache_system_prompt(self) -> None:
+        """
+        Evaluate the system prompt once and snapshot the KV state.
+
+        Every cleaning request shares the system prompt, so restoring this
+        snapshot skips re-evaluating it.
+        """
+        try:
+            self._llama.create_chat_completion(
+                messages=self._get_messages(""), max_tokens=1
+            )
+            self._prefix_state = self._llama.save_state()
+        except Exception as e:
+            print(f"⚠️ Could not cache text cleaner system prompt: {e}")
+            self._prefix_state = None
+
     def _get_messages(self, raw_text: str) -> list[dict[str, str]]:
         """
         Get messages for chat completion API.
@@ -161,6 +189,93 @@ class TextCleaner:
         self._model_loaded = False
 
 
+class IncrementalTextCleaner:
+    """
+    Cleans new transcript text on a background thread.
+
+    Only the newest raw text is sent to the model. If the model falls behind,
+    every pending piece is merged into a single request, so latency stays
+    bounded by one model call instead of growing with the backlog.
+    """
+
+    def __init__(
+        self,
+        text_cleaner: TextCleaner,
+        on_cleaned: Callable[[str], None],
+        max_batch_words: int = 150,
+    ):
+        """
+        Initialize the incremental cleaner.
+
+        Args:
+            text_cleaner: Loaded text cleaner
+            on_cleaned: Called with each cleaned batch, in submission order
+            max_batch_words: Maximum words merged into one request
+        """
+        self.text_cleaner = text_cleaner
+        self.on_cleaned = on_cleaned
+        self.max_batch_words = max_batch_words
+        self._queue: queue.Queue[str | None] = queue.Queue()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """Start the cleaning thread."""
+        if self._thread is not None:
+            return
+
+        self._thread = threading.Thread(target=self._worker, daemon=True)
+        self._thread.start()
+
+    def submit(self, raw_text: str) -> None:
+        """
+        Queue new raw text for cleaning.
+
+        Args:
+            raw_text: Text not seen by the cleaner before
+        """
+        if raw_text.strip():
+            self._queue.put(raw_text)
+
+    def close(self, timeout: float | None = None) -> None:
+        """
+        Clean everything still queued, then stop the thread.
+
+        Args:
+            timeout: Seconds to wait for the queue to drain
+        """
+        if self._thread is None:
+            return
+
+        self._queue.put(None)
+        self._thread.join(timeout=timeout)
+        self._thread = None
+
+    def _worker(self) -> None:
+        """Merge whatever is pending into one request and clean it."""
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is None:
+                break
+
+            batch = [item]
+            words = len(item.split())
+            while words < self.max_batch_words:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+                words += len(item.split())
+
+            cleaned = self.text_cleaner.clean_text(" ".join(batch))
+            if cleaned:
+                self.on_cleaned(cleaned)
+
+
 def create_text_cleaner(config: Config) -> TextCleaner | None:
     """
     Create text cleaner with fallback for missing dependencies or model files.
@@ -4,13 +4,37 @@ import argparse
 import os
 import sys
 
-from .config import Config
-from .model_downloader import ModelDownloader
-from .model_wrapper import LFM2AudioWrapper
+# Heavy modules (NumPy, pydantic-settings, huggingface_hub) are imported inside
+# the functions that need them, so `--help` and argument errors return at once.
 
 # from .auto_download import download_model_files_and_llama_cpp
 
 
+def _prepare_models(config, skip_download_check: bool = False):
+    """
+    Make sure the model files and llama.cpp builds are on disk.
+
+    Args:
+        config: Configuration object
+        skip_download_check: Skip the download step when the cached download
+            manifest matches the files on disk
+
+    Returns:
+        ModelDownloader for the configured model directory
+    """
+    from .model_downloader import ModelDownloader
+
+    try:
+        model_downloader = ModelDownloader(target_dir=config.base_dir)
+        if not (skip_download_check and model_downloader.is_downloaded()):
+            model_downloader.download()
+    except Exception as e:
+        print(f"⚠️  Warning: Failed to auto-download llama.cpp builds: {e}")
+        sys.exit(1)
+
+    return model_downloader
+
+
 def main(
     audio_file: str,
     play_audio: bool = False,
@@ -18,17 +42,29 @@ def main(
     log_partial_transcripts: str = None,
     typewriter_effect: bool = False,
     typewriter_speed: float = None,
+    num_workers: int = None,
+    vad: bool = False,
+    metrics_csv: str = None,
+    metrics_prom: str = None,
+    show_metrics: bool = False,
+    chunk_duration: float = 2.0,
+    overlap: float = 0.5,
+    skip_download_check: bool = False,
 ):
     """Test real-time transcription functionality."""
+    # Validate audio file exists before loading anything
+    if not os.path.exists(audio_file):
+        print(f"❌ Audio file not found: {audio_file}")
+        print("💡 Make sure the audio file exists at the specified path")
+        return
+
+    from .config import Config
+    from .model_wrapper import LFM2AudioWrapper
+
     config = Config()
 
     # Ensure llama.cpp builds are available
-    try:
-        model_downloader = ModelDownloader(target_dir=config.base_dir)
-        model_downloader.download()
-    except Exception as e:
-        print(f"⚠️  Warning: Failed to auto-download llama.cpp builds: {e}")
-        sys.exit(1)
+    model_downloader = _prepare_models(config, skip_download_check)
 
     print("🚀 Testing Real-Time Audio Transcription")
     if clean_text:
@@ -39,42 +75,399 @@ def main(
     if typewriter_speed is not None:
         config.typewriter_speed = typewriter_speed
 
+    if num_workers is not None:
+        config.num_workers = num_workers
+
     model = LFM2AudioWrapper(model_downloader, config)
 
-    # Validate audio file exists
-    if not os.path.exists(audio_file):
-        print(f"❌ Audio file not found: {audio_file}")
-        print("💡 Make sure the audio file exists at the specified path")
-        return
+    metrics = None
+    if show_metrics or metrics_csv or metrics_prom:
+        from .metrics import LatencyMetrics
+
+        metrics = LatencyMetrics()
 
     try:
+        model.warm_up()
+
         # Process with real-time timing and optional features
         transcription = model.transcribe_with_real_timing(
             audio_file_path=audio_file,
-            chunk_duration=2.0,  # 2 second chunks
-            overlap=0.5,  # 0.5 second overlap
+            chunk_duration=chunk_duration,
+            overlap=overlap,
             play_audio=play_audio,
             clean_text=clean_text,
             log_partial_transcripts=log_partial_transcripts,
             typewriter_effect=typewriter_effect,
+            num_workers=config.num_workers,
+            chunk_strategy="vad" if vad else "fixed",
+            metrics=metrics,
         )
 
         print("\n🎯 Final Result:")
         print(transcription)
 
+        if metrics_csv:
+            metrics.write_csv(metrics_csv)
+            print(f"📊 Chunk latencies written to {metrics_csv}")
+        if metrics_prom:
+            metrics.write_prometheus(metrics_prom)
+            print(f"📊 Latency summary written to {metrics_prom}")
+
     except FileNotFoundError as e:
         print(f"❌ Audio file not found: {e}")
         print("💡 Make sure the audio file exists at the specified path")
     except Exception as e:
         print(f"❌ Error during transcription: {e}")
         raise e
+    finally:
+        model.close()
+
+
+def batch_main(
+    pattern: str,
+    output_path: str,
+    jobs: int = 2,
+    num_workers: int = None,
+    vad: bool = False,
+    chunk_duration: float = 2.0,
+    overlap: float = 0.5,
+    skip_download_check: bool = False,
+):
+    """Transcribe an archive of audio files without real-time pacing."""
+    from .batch import expand_audio_inputs, transcribe_batch
+    from .config import Config
+
+    if not expand_audio_inputs(pattern):
+        print(f"❌ No audio files found for: {pattern}")
+        return
+
+    config = Config()
+
+    if num_workers is not None:
+        config.num_workers = num_workers
+
+    # Download once up front so pool processes don't race on the target dir
+    model_downloader = _prepare_models(config, skip_download_check)
+
+    # The page cache is shared, so every pool process benefits
+    model_downloader.warm_up()
+
+    failures = transcribe_batch(
+        pattern,
+        output_path,
+        config,
+        jobs=jobs,
+        chunk_duration=chunk_duration,
+        overlap=overlap,
+        chunk_strategy="vad" if vad else "fixed",
+    )
+    if failures:
+        sys.exit(1)
+
+
+def microphone_main(
+    max_duration: float = None,
+    num_workers: int = None,
+    show_metrics: bool = False,
+    chunk_duration: float = 2.0,
+    overlap: float = 0.5,
+    skip_download_check: bool = False,
+):
+    """Transcribe live microphone audio."""
+    from .config import Config
+    from .model_wrapper import LFM2AudioWrapper
+
+    config = Config()
+
+    if num_workers is not None:
+        config.num_workers = num_workers
+
+    model_downloader = _prepare_models(config, skip_download_check)
+
+    metrics = None
+    if show_metrics:
+        from .metrics import LatencyMetrics
+
+        metrics = LatencyMetrics()
+
+    model = LFM2AudioWrapper(model_downloader, config)
+    try:
+        model.warm_up()
+        model.transcribe_microphone(
+            max_duration=max_duration,
+            chunk_duration=chunk_duration,
+            overlap=overlap,
+            metrics=metrics,
+        )
+    finally:
+        model.close()
+
+
+def benchmark_main(
+    quantizations: list[str],
+    reference_set: str = None,
+    output_path: str = None,
+    chunk_duration: float = 2.0,
+    overlap: float = 0.5,
+):
+    """Compare quantizations on real-time factor, peak RSS and WER."""
+    from .benchmark import HARVARD_REFERENCE, run_benchmark
+    from .config import Config
+    from .model_downloader import ModelDownloader
+    from .wer import load_references
+
+    config = Config()
+
+    if reference_set:
+        references = load_references(reference_set)
+    else:
+        try:
+            harvard_path = ModelDownloader(target_dir=config.base_dir).download_example(
+                "harvard.wav"
+            )
+        except Exception as e:
+            print(f"❌ Failed to download the reference sample: {e}")
+            sys.exit(1)
+        references = [(harvard_path, HARVARD_REFERENCE)]
+
+    print(f"📏 Reference set: {len(references)} files")
+    results = run_benchmark(
+        config,
+        quantizations,
+        references,
+        chunk_duration=chunk_duration,
+        overlap=overlap,
+        output_path=output_path,
+    )
+    if any("error" in r for r in results):
+        sys.exit(1)
+
+
+def _add_benchmark_arguments(parser: argparse.ArgumentParser):
+    """Arguments of the `transcribe benchmark` subcommand."""
+    parser.add_argument(
+        "--quantizations",
+        nargs="+",
+        default=["Q8_0"],
+        help="Quantizations to download and compare (default: Q8_0)",
+    )
+    parser.add_argument(
+        "--reference-set",
+        help='JSONL file with {"audio": ..., "reference": ...} per line '
+        "(default: the harvard.wav sample from the model repo)",
+    )
+    parser.add_argument(
+        "--output",
+        help="JSONL file to append one result per quantization to",
+    )
+    parser.add_argument(
+        "--chunk-duration",
+        type=float,
+        default=2.0,
+        help="Duration of each transcribed chunk in seconds (default: 2.0)",
+    )
+    parser.add_argument(
+        "--overlap",
+        type=float,
+        default=0.5,
+        help="Overlap between consecutive chunks in seconds (default: 0.5)",
+    )
+
+
+def sweep_main(
+    reference_set: str,
+    output_path: str,
+    chunk_durations: list[float],
+    overlaps: list[float],
+    chunk_strategies: list[str],
+    jobs: int = 2,
+    noise_margins_db: list[float] = None,
+    min_silence_durations: list[float] = None,
+):
+    """Evaluate chunking settings on a reference corpus."""
+    from .config import Config
+    from .sweep import run_sweep
+    from .wer import load_references
+
+    references = load_references(reference_set)
+    config = Config()
+
+    # Download once up front so pool processes don't race on the target dir
+    model_downloader = _prepare_models(config)
+
+    # The page cache is shared, so every pool process benefits
+    model_downloader.warm_up()
+
+    run_sweep(
+        references,
+        config,
+        chunk_durations,
+        overlaps,
+        chunk_strategies,
+        output_path,
+        jobs=jobs,
+        noise_margins_db=noise_margins_db,
+        min_silence_durations=min_silence_durations,
+    )
+
+
+def _add_sweep_arguments(parser: argparse.ArgumentParser):
+    """Arguments of the `transcribe sweep` subcommand."""
+    parser.add_argument(
+        "--reference-set",
+        required=True,
+        help='JSONL file with {"audio": ..., "reference": ...} per line',
+    )
+    parser.add_argument(
+        "--chunk-durations",
+        type=float,
+        nargs="+",
+        default=[1.0, 2.0, 3.0, 5.0],
+        help="Chunk durations to try, in seconds (default: 1 2 3 5)",
+    )
+    parser.add_argument(
+        "--overlaps",
+        type=float,
+        nargs="+",
+        default=[0.0, 0.5, 1.0],
+        help="Overlaps to try, in seconds (default: 0 0.5 1)",
+    )
+    parser.add_argument(
+        "--chunking",
+        nargs="+",
+        choices=["fixed", "vad"],
+        default=["fixed", "vad"],
+        help="Chunking strategies to try (default: fixed vad)",
+    )
+    parser.add_argument(
+        "--vad-noise-margins",
+        type=float,
+        nargs="+",
+        default=[6.0, 12.0, 18.0],
+        help="dB above the noise floor a frame needs to count as speech, "
+        "tried with --chunking vad (default: 6 12 18)",
+    )
+    parser.add_argument(
+        "--vad-min-silences",
+        type=float,
+        nargs="+",
+        default=[0.3, 0.6],
+        help="Shortest pause, in seconds, that splits speech, "
+        "tried with --chunking vad (default: 0.3 0.6)",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=2,
+        help="Number of worker processes, each loading its own model (default: 2)",
+    )
+    parser.add_argument(
+        "--output",
+        default="sweep.csv",
+        help="CSV file to write the comparison table to (default: sweep.csv)",
+    )
+
+
+def serve_main(
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    num_workers: int = None,
+    skip_download_check: bool = False,
+):
+    """Serve transcription sessions over HTTP with one resident model."""
+    from .config import Config
+    from .model_wrapper import LFM2AudioWrapper
+    from .transcription_server import TranscriptionServer
+
+    config = Config()
+
+    if num_workers is not None:
+        config.num_workers = num_workers
+
+    model_downloader = _prepare_models(config, skip_download_check)
+
+    model = LFM2AudioWrapper(model_downloader, config)
+    model.warm_up()
+
+    server = TranscriptionServer(
+        (host, port),
+        model,
+        num_workers=config.num_workers,
+        buffer_seconds=config.ring_buffer_seconds,
+    )
+    print(f"🌐 Serving on http://{host}:{port} with {config.num_workers} workers")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        model.close()
+
+
+def _add_serve_arguments(parser: argparse.ArgumentParser):
+    """Arguments of the `transcribe serve` subcommand."""
+    parser.add_argument(
+        "--host",
+        default="127.0.0.1",
+        help="Interface to listen on (default: 127.0.0.1)",
+    )
+    parser.add_argument(
+        "--port", type=int, default=8000, help="Port to listen on (default: 8000)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of chunks transcribed concurrently across all sessions "
+        "(default: 1)",
+    )
+    parser.add_argument(
+        "--skip-download-check",
+        action="store_true",
+        help="Skip the download step when the cached manifest matches the files",
+    )
 
 
 def cli():
     """CLI entry point for the transcribe command."""
     parser = argparse.ArgumentParser(description="Real-time audio transcription")
-    parser.add_argument(
-        "--audio", required=True, help="Path to the audio file to transcribe"
+    subcommands = parser.add_subparsers(dest="command", title="subcommands")
+    _add_benchmark_arguments(
+        subcommands.add_parser(
+            "benchmark",
+            help="Compare model quantizations on a reference set",
+            description="Compare model quantizations on a reference set",
+        )
+    )
+    _add_sweep_arguments(
+        subcommands.add_parser(
+            "sweep",
+            help="Compare WER and real-time factor across chunking settings",
+            description="Compare WER and real-time factor across chunking settings",
+        )
+    )
+    _add_serve_arguments(
+        subcommands.add_parser(
+            "serve",
+            help="Transcribe many concurrent clients with one resident model",
+            description="Transcribe many concurrent clients with one resident model",
+        )
+    )
+
+    # Required unless a subcommand is given, which argparse cannot express
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--audio", help="Path to the audio file to transcribe")
+    source.add_argument(
+        "--batch",
+        metavar="PATH_OR_GLOB",
+        help="Directory or glob of audio files to transcribe offline, "
+        "without real-time pacing",
+    )
+    source.add_argument(
+        "--microphone",
+        action="store_true",
+        help="Transcribe live audio from the default input device",
     )
     parser.add_argument(
         "--play-audio",
@@ -102,8 +495,126 @@ def cli():
         default=0.01,
         help="Speed of typewriter effect in seconds per character (default: 0.01)",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of chunks transcribed concurrently (default: 1)",
+    )
+    parser.add_argument(
+        "--chunk-duration",
+        type=float,
+        default=2.0,
+        help="Duration of each transcribed chunk in seconds (default: 2.0)",
+    )
+    parser.add_argument(
+        "--overlap",
+        type=float,
+        default=0.5,
+        help="Overlap between consecutive chunks in seconds (default: 0.5)",
+    )
+    parser.add_argument(
+        "--vad",
+        action="store_true",
+        help="Skip silent regions and cut chunks at pauses instead of fixed windows",
+    )
+    parser.add_argument(
+        "--metrics",
+        action="store_true",
+        help="Print p50/p95/p99 latency of every pipeline stage",
+    )
+    parser.add_argument(
+        "--metrics-csv",
+        help="CSV file to write per-chunk stage latencies to",
+    )
+    parser.add_argument(
+        "--metrics-prom",
+        help="Prometheus textfile to write stage latency summaries to",
+    )
+    parser.add_argument(
+        "--duration",
+        type=float,
+        default=None,
+        help="Seconds of --microphone audio to transcribe (default: until Ctrl+C)",
+    )
+    parser.add_argument(
+        "--output",
+        default="transcriptions.jsonl",
+        help="JSONL file that --batch appends one result per file to "
+        "(default: transcriptions.jsonl)",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=2,
+        help="Number of --batch worker processes, each loading its own model "
+        "(default: 2)",
+    )
+    parser.add_argument(
+        "--skip-download-check",
+        action="store_true",
+        help="Skip the download step when the cached manifest matches the files; "
+        "falls back to a full download if files are missing or truncated",
+    )
     args = parser.parse_args()
 
+    if args.command == "benchmark":
+        benchmark_main(
+            args.quantizations,
+            args.reference_set,
+            args.output,
+            args.chunk_duration,
+            args.overlap,
+        )
+        return
+
+    if args.command == "sweep":
+        sweep_main(
+            args.reference_set,
+            args.output,
+            args.chunk_durations,
+            args.overlaps,
+            args.chunking,
+            args.jobs,
+            args.vad_noise_margins,
+            args.vad_min_silences,
+        )
+        return
+
+    if args.command == "serve":
+        serve_main(args.host, args.port, args.workers, args.skip_download_check)
+        return
+
+    if not (args.audio or args.batch or args.microphone):
+        parser.error(
+            "one of the arguments --audio --batch --microphone or a subcommand "
+            "is required"
+        )
+
+    if args.microphone:
+        microphone_main(
+            args.duration,
+            args.workers,
+            args.metrics,
+            args.chunk_duration,
+            args.overlap,
+            args.skip_download_check,
+        )
+        return
+
+    if args.batch:
+        batch_main(
+            args.batch,
+            args.output,
+            args.jobs,
+            args.workers,
+            args.vad,
+            args.chunk_duration,
+            args.overlap,
+            args.skip_download_check,
+        )
+        return
+
     main(
         args.audio,
         args.play_audio,
@@ -111,6 +622,14 @@ def cli():
         args.log_partial_transcripts,
         args.typewriter,
         args.typewriter_speed,
+        args.workers,
+        args.vad,
+        args.metrics_csv,
+        args.metrics_prom,
+        args.metrics,
+        args.chunk_duration,
+        args.overlap,
+        args.skip_download_check,
     )
 
 
@@ -0,0 +1,14 @@
+"""Structured result of transcribing a single audio chunk."""
+
+from dataclasses import dataclass, field
+
+
+@dataclass
+class TranscriptionResult:
+    """Transcribed text plus the timings reported by the runner."""
+
+    text: str
+    # Runner-reported stage timings in milliseconds. Keys, when available:
+    # "encode_ms" (audio encoder), "prompt_ms" (prompt evaluation, including
+    # the encoded audio), "decode_ms" (text generation)
+    timings: dict[str, float] = field(default_factory=dict)
@@ -0,0 +1,380 @@
+"""HTTP server that transcribes many concurrent sessions with one resident model."""
+
+import io
+import json
+import queue
+import threading
+import time
+from collections import OrderedDict, deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from itertools import count
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+from .audio_preprocessing import AudioChunker
+from .microphone import AudioRingBuffer, iter_ring_windows
+from .model_wrapper import LFM2AudioWrapper
+from .stitching import TranscriptStitcher
+from .transcription_result import TranscriptionResult
+
+
+class FairScheduler:
+    """
+    Fixed pool of inference workers shared fairly between sessions.
+
+    Every session has its own FIFO of chunks. Workers take one chunk at a
+    time from each session in turn, so a long upload cannot starve short or
+    live sessions queued behind it.
+    """
+
+    def __init__(self, num_workers: int = 1):
+        """
+        Initialize the scheduler. Workers do not run until `start()`.
+
+        Args:
+            num_workers: Number of chunks inferred concurrently
+        """
+        self.num_workers = num_workers
+        # Session id -> pending (future, fn, args), in round-robin order
+        self._queues: OrderedDict[int, deque] = OrderedDict()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._threads: list[threading.Thread] = []
+
+    def start(self) -> None:
+        """Start the worker threads."""
+        for i in range(self.num_workers):
+            thread = threading.Thread(
+                target=self._worker, name=f"asr-worker-{i}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(self, session_id: int, fn: Callable, *args) -> Future:
+        """
+        Queue a call on behalf of a session.
+
+        Args:
+            session_id: Session the call is scheduled for
+            fn: Function to run on a worker
+            *args: Arguments for `fn`
+
+        Returns:
+            Future resolving to the result of `fn`
+        """
+        future = Future()
+        with self._cond:
+            self._queues.setdefault(session_id, deque()).append((future, fn, args))
+            self._cond.notify()
+        return future
+
+    def cancel(self, session_id: int) -> None:
+        """Drop every call still queued for a session."""
+        with self._cond:
+            for future, _, _ in self._queues.pop(session_id, ()):
+                future.cancel()
+
+    def queued(self) -> int:
+        """Number of calls waiting for a worker."""
+        with self._cond:
+            return sum(len(q) for q in self._queues.values())
+
+    def close(self) -> None:
+        """Stop the workers once they finish their current call."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        for thread in self._threads:
+            thread.join()
+
+    def _next(self) -> tuple[Future, Callable, tuple] | None:
+        """Take the next call, rotating between sessions."""
+        with self._cond:
+            self._cond.wait_for(lambda: self._queues or self._closed)
+            if self._closed:
+                return None
+
+            session_id, pending = next(iter(self._queues.items()))
+            job = pending.popleft()
+            if pending:
+                self._queues.move_to_end(session_id)
+            else:
+                del self._queues[session_id]
+            return job
+
+    def _worker(self) -> None:
+        """Run queued calls until closed."""
+        while (job := self._next()) is not None:
+            future, fn, args = job
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(fn(*args))
+            except Exception as e:
+                future.set_exception(e)
+
+
+class TranscriptionRequestHandler(BaseHTTPRequestHandler):
+    """
+    Serves one transcription session per request.
+
+    Endpoints:
+        POST /transcribe  Body is an audio file in any format soundfile reads
+        POST /stream      Body is raw 16-bit little-endian PCM, sent as it is
+                          captured (chunked transfer encoding), described by
+                          the `sample_rate` and `channels` query parameters
+        GET  /health      Server status
+
+    Both POST endpoints accept `chunk_duration` and `overlap` query
+    parameters and stream one JSON line per chunk back as soon as it is
+    transcribed: {"chunk", "start_s", "end_s", "text"}, where `text` holds
+    only the new words. A final {"done": true, "transcript"} line closes the
+    response.
+    """
+
+    server: "TranscriptionServer"
+
+    def do_GET(self):
+        """Report server status."""
+        if urlparse(self.path).path != "/health":
+            self.send_error(404)
+            return
+
+        self._send_json(
+            {
+                "status": "ok",
+                "sessions": self.server.active_sessions,
+                "queued_chunks": self.server.scheduler.queued(),
+            }
+        )
+
+    def do_POST(self):
+        """Transcribe an uploaded file or a live PCM stream."""
+        url = urlparse(self.path)
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+
+        try:
+            chunk_duration = float(params.get("chunk_duration", 2.0))
+            overlap = float(params.get("overlap", 0.5))
+            if not 0 <= overlap < chunk_duration:
+                raise ValueError("overlap must be in [0, chunk_duration)")
+
+            if url.path == "/transcribe":
+                chunker = AudioChunker(
+                    chunk_duration=chunk_duration,
+                    overlap=overlap,
+                    strategy=params.get("chunking", "fixed"),
+                )
+                audio_data, sample_rate = chunker.load_audio(
+                    io.BytesIO(b"".join(self._iter_body()))
+                )
+                windows = chunker.iter_windows(audio_data, sample_rate)
+            elif url.path == "/stream":
+                sample_rate = int(params.get("sample_rate", 16000))
+                channels = int(params.get("channels", 1))
+                windows = self._iter_stream_windows(
+                    sample_rate, channels, chunk_duration, overlap
+                )
+            else:
+                self.send_error(404)
+                return
+        except Exception as e:
+            self.send_error(400, explain=str(e))
+            return
+
+        self._run_session(windows, sample_rate)
+
+    def _run_session(
+        self, windows: Iterator[tuple[np.ndarray, float, float]], sample_rate: int
+    ) -> None:
+        """Schedule the windows and stream their transcriptions back in order."""
+        server = self.server
+        session_id = next(server.session_ids)
+        stitcher = TranscriptStitcher()
+        # (chunk_index, start, end, future) in chunk order; None ends the session
+        in_flight: queue.SimpleQueue = queue.SimpleQueue()
+        # Backpressure: a session stops cutting windows while this many of its
+        # chunks are still waiting to be written, instead of queueing its
+        # whole stream behind a busy scheduler
+        in_flight_slots = threading.Semaphore(2 * server.scheduler.num_workers)
+        disconnected = threading.Event()
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+
+        def write_results() -> None:
+            """Write each chunk's new words as soon as it is its turn."""
+            while (item := in_flight.get()) is not None:
+                try:
+                    write_result(*item)
+                finally:
+                    in_flight_slots.release()
+
+        def write_result(chunk_index, chunk_start, chunk_end, future) -> None:
+            """Write one chunk's new words, or its error."""
+            if disconnected.is_set():
+                return
+            try:
+                result: TranscriptionResult = future.result()
+                message = {
+                    "chunk": chunk_index,
+                    "start_s": round(chunk_start, 3),
+                    "end_s": round(chunk_end, 3),
+                    "text": stitcher.add(result.text),
+                }
+            except Exception as e:
+                message = {"chunk": chunk_index, "error": str(e)}
+            try:
+                self._write_line(message)
+            except OSError:
+                # Client went away; stop scheduling its chunks
+                disconnected.set()
+                server.scheduler.cancel(session_id)
+
+        writer = threading.Thread(target=write_results, daemon=True)
+        writer.start()
+
+        with server.track_session():
+            try:
+                for chunk_index, (chunk, chunk_start, chunk_end) in enumerate(windows):
+                    in_flight_slots.acquire()
+                    if disconnected.is_set():
+                        break
+                    # Copy: ring buffer views are overwritten while queued
+                    future = server.scheduler.submit(
+                        session_id,
+                        server.model.transcribe_audio_data_detailed,
+                        np.array(chunk),
+                        sample_rate,
+                    )
+                    in_flight.put((chunk_index, chunk_start, chunk_end, future))
+            finally:
+                in_flight.put(None)
+                writer.join()
+
+        if not disconnected.is_set():
+            try:
+                self._write_line({"done": True, "transcript": stitcher.text})
+            except OSError:
+                pass
+
+    def _iter_stream_windows(
+        self, sample_rate: int, channels: int, chunk_duration: float, overlap: float
+    ) -> Iterator[tuple[np.ndarray, float, float]]:
+        """Cut windows from PCM frames while they are still being received."""
+        ring = AudioRingBuffer(int(self.server.buffer_seconds * sample_rate))
+        frame_bytes = 2 * channels
+
+        def read_frames() -> None:
+            """Convert the request body to mono float32 as it arrives."""
+            leftover = b""
+            try:
+                for data in self._iter_body():
+                    data = leftover + data
+                    usable = len(data) - len(data) % frame_bytes
+                    leftover = data[usable:]
+                    samples = (
+                        np.frombuffer(data[:usable], dtype="<i2").astype(np.float32)
+                        / 32768.0
+                    )
+                    if channels > 1:
+                        samples = samples.reshape(-1, channels).mean(axis=1)
+                    ring.write(samples)
+            finally:
+                ring.close()
+
+        threading.Thread(target=read_frames, daemon=True).start()
+        return iter_ring_windows(ring, sample_rate, chunk_duration, overlap)
+
+    def _iter_body(self) -> Iterator[bytes]:
+        """Yield the request body as it arrives, chunked or not."""
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            while True:
+                size = int(self.rfile.readline().split(b";")[0].strip(), 16)
+                if size == 0:
+                    # Skip trailers up to the terminating blank line
+                    while self.rfile.readline().strip():
+                        pass
+                    return
+                yield self.rfile.read(size)
+                self.rfile.readline()  # CRLF after each chunk
+        else:
+            remaining = int(self.headers.get("Content-Length", 0))
+            while remaining > 0:
+                data = self.rfile.read(min(remaining, 64 * 1024))
+                if not data:
+                    return
+                remaining -= len(data)
+                yield data
+
+    def _write_line(self, message: dict) -> None:
+        """Write one JSON line and flush it to the client."""
+        self.wfile.write(json.dumps(message, ensure_ascii=False).encode() + b"\n")
+        self.wfile.flush()
+
+    def _send_json(self, message: dict) -> None:
+        """Send a complete JSON response."""
+        body = json.dumps(message).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        """Log requests with a timestamp."""
+        timestamp = time.strftime("%H:%M:%S")
+        print(f"🌐 {timestamp} {self.address_string()} {format % args}")
+
+
+class TranscriptionServer(ThreadingHTTPServer):
+    """Threaded HTTP server sharing one resident model between sessions."""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        model: LFM2AudioWrapper,
+        num_workers: int = 1,
+        buffer_seconds: float = 30.0,
+    ):
+        """
+        Initialize the server and start the inference workers.
+
+        Args:
+            address: (host, port) to listen on
+            model: Model wrapper, already started
+            num_workers: Number of chunks inferred concurrently across sessions
+            buffer_seconds: Seconds of audio buffered per streaming session
+        """
+        super().__init__(address, TranscriptionRequestHandler)
+        self.model = model
+        self.buffer_seconds = buffer_seconds
+        self.scheduler = FairScheduler(num_workers)
+        self.scheduler.start()
+        self.session_ids = count()
+        self.active_sessions = 0
+        self._sessions_lock = threading.Lock()
+
+    @contextmanager
+    def track_session(self) -> Iterator[None]:
+        """Count a session as active while the block runs."""
+        with self._sessions_lock:
+            self.active_sessions += 1
+        try:
+            yield
+        finally:
+            with self._sessions_lock:
+                self.active_sessions -= 1
+
+    def server_close(self):
+        """Stop the inference workers and close the socket."""
+        self.scheduler.close()
+        super().server_close()
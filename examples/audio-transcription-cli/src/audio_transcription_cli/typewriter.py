@@ -0,0 +1,105 @@
+"""Typewriter-style console output rendered off the transcription thread."""
+
+import queue
+import re
+import threading
+import time
+
+
+def _sleep_until(deadline: float) -> None:
+    """Sleep until the given `time.monotonic()` deadline, if it is ahead."""
+    if (delay := deadline - time.monotonic()) > 0:
+        time.sleep(delay)
+
+
+class TypewriterDisplay:
+    """
+    Prints text character by character on its own thread.
+
+    `write` only enqueues text, so the transcription loop is never delayed.
+    Characters are paced against a running deadline rather than a fixed sleep
+    per character, so print overhead does not add up. When the display falls
+    behind, either late against its deadline or with more text already
+    queued, it catches up by printing whole words at a time.
+    """
+
+    def __init__(self, speed: float = 0.05, respect_words: bool = True):
+        """
+        Initialize the display. Rendering does not begin until `start()`.
+
+        Args:
+            speed: Seconds per character
+            respect_words: Whether to pause slightly at word boundaries
+        """
+        self.speed = speed
+        self.respect_words = respect_words
+        self._queue: queue.SimpleQueue[str | None] = queue.SimpleQueue()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """Start the rendering thread."""
+        if self._thread is not None:
+            return
+
+        self._thread = threading.Thread(target=self._render, daemon=True)
+        self._thread.start()
+
+    def write(self, text: str) -> None:
+        """
+        Queue text for display. Returns immediately.
+
+        Args:
+            text: Text to display
+        """
+        if text:
+            self._queue.put(text)
+
+    def close(self) -> None:
+        """Show the remaining text, catching up word by word, and stop."""
+        if self._thread is None:
+            return
+
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+
+    def _is_behind(self, deadline: float) -> bool:
+        """Whether to drop the per-character effect to catch up."""
+        return not self._queue.empty() or time.monotonic() > deadline + self.speed
+
+    def _render(self) -> None:
+        """Consume queued text, pacing output against a deadline."""
+        deadline = time.monotonic()
+
+        while (text := self._queue.get()) is not None:
+            # Idle time since the last text does not count as lag
+            deadline = max(deadline, time.monotonic())
+
+            # Split into words and the exact whitespace between them
+            for piece in re.findall(r"\s+|\S+", text):
+                if piece.isspace():
+                    _sleep_until(deadline)
+                    print(piece, end="", flush=True)
+                    deadline += self.speed * 0.5  # Shorter pause for spaces
+                elif self._is_behind(deadline):
+                    # Catch up by showing the whole word, one word per tick
+                    print(piece, end="", flush=True)
+                    deadline = time.monotonic() + self.speed
+                else:
+                    for char in piece:
+                        _sleep_until(deadline)
+                        print(char, end="", flush=True)
+                        deadline += self.speed
+
+                    # Small pause at word boundaries if enabled
+                    if self.respect_words:
+                        deadline += self.speed * 1.5
+
+    def __enter__(self):
+        """Context manager entry."""
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit with cleanup."""
+        self.close()
@@ -0,0 +1,146 @@
+"""Energy-based voice activity detection for speech-gated chunking."""
+
+from collections.abc import Iterator
+
+import numpy as np
+
+
+class EnergyVAD:
+    """Frame-energy voice activity detector with an adaptive threshold."""
+
+    def __init__(
+        self,
+        frame_duration: float = 0.03,
+        noise_margin_db: float = 12.0,
+        min_threshold_db: float = -55.0,
+        max_threshold_db: float = -30.0,
+        min_speech_duration: float = 0.25,
+        min_silence_duration: float = 0.3,
+        padding_duration: float = 0.15,
+    ):
+        """
+        Initialize the detector.
+
+        Args:
+            frame_duration: Analysis frame length in seconds
+            noise_margin_db: How far above the estimated noise floor a frame
+                must be to count as speech
+            min_threshold_db: Lower bound for the speech threshold, in dBFS
+            max_threshold_db: Upper bound for the speech threshold, in dBFS
+            min_speech_duration: Speech regions shorter than this are dropped
+            min_silence_duration: Pauses shorter than this do not split speech
+            padding_duration: Speech regions are extended by this much on both
+                sides so word onsets and tails are not clipped
+        """
+        self.frame_duration = frame_duration
+        self.noise_margin_db = noise_margin_db
+        self.min_threshold_db = min_threshold_db
+        self.max_threshold_db = max_threshold_db
+        self.min_speech_duration = min_speech_duration
+        self.min_silence_duration = min_silence_duration
+        self.padding_duration = padding_duration
+
+    def _frames(self, seconds: float) -> int:
+        """Convert a duration to a number of analysis frames."""
+        return int(round(seconds / self.frame_duration))
+
+    def frame_energies_db(self, audio_data: np.ndarray, sample_rate: int) -> np.ndarray:
+        """
+        Compute the RMS energy of every analysis frame.
+
+        Args:
+            audio_data: Audio samples, mono or (frames, channels)
+            sample_rate: Sample rate of the audio data
+
+        Returns:
+            Energy per frame in dBFS
+        """
+        mono = audio_data.mean(axis=1) if audio_data.ndim > 1 else audio_data
+        frame_len = max(1, int(self.frame_duration * sample_rate))
+        num_frames = -(-len(mono) // frame_len)
+
+        # Zero-pad the last partial frame so the signal reshapes into frames
+        padded = np.zeros(num_frames * frame_len, dtype=np.float32)
+        padded[: len(mono)] = mono
+        frames = padded.reshape(num_frames, frame_len)
+
+        rms = np.sqrt(np.mean(np.square(frames), axis=1) + 1e-12)
+        return 20.0 * np.log10(rms)
+
+    def speech_segments(self, energies_db: np.ndarray) -> list[tuple[int, int]]:
+        """
+        Find speech regions from per-frame energies.
+
+        Args:
+            energies_db: Energy per frame, as returned by `frame_energies_db`
+
+        Returns:
+            List of (start_frame, end_frame) ranges, end exclusive
+        """
+        if len(energies_db) == 0:
+            return []
+
+        # The quietest frames give the noise floor of this recording
+        noise_floor = np.percentile(energies_db, 10)
+        threshold = np.clip(
+            noise_floor + self.noise_margin_db,
+            self.min_threshold_db,
+            self.max_threshold_db,
+        )
+        mask = energies_db > threshold
+
+        # Dilate so onsets and tails around speech are kept
+        padding = self._frames(self.padding_duration)
+        if padding:
+            mask = np.convolve(mask, np.ones(2 * padding + 1), mode="same") > 0
+
+        # Run-length encode the mask into [start, end) ranges
+        edges = np.diff(np.concatenate(([0], mask.astype(np.int8), [0])))
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1)
+        if len(starts) == 0:
+            return []
+
+        # Bridge pauses that are too short to be a real break
+        keep = (starts[1:] - ends[:-1]) >= self._frames(self.min_silence_duration)
+        starts = np.concatenate((starts[:1], starts[1:][keep]))
+        ends = np.concatenate((ends[:-1][keep], ends[-1:]))
+
+        # Drop clicks and other short bursts
+        long_enough = (ends - starts) >= self._frames(self.min_speech_duration)
+        return list(
+            zip(starts[long_enough].tolist(), ends[long_enough].tolist(), strict=True)
+        )
+
+    def iter_windows(
+        self, audio_data: np.ndarray, sample_rate: int, max_duration: float
+    ) -> Iterator[tuple[int, int]]:
+        """
+        Split speech into windows no longer than `max_duration`.
+
+        Silence between speech regions is skipped. Speech regions longer than
+        `max_duration` are cut at the quietest frame in the second half of
+        each window, so cuts land in pauses rather than mid-word.
+
+        Args:
+            audio_data: Audio samples, mono or (frames, channels)
+            sample_rate: Sample rate of the audio data
+            max_duration: Maximum window length in seconds
+
+        Yields:
+            Tuple of (start_sample, end_sample), end exclusive
+        """
+        energies_db = self.frame_energies_db(audio_data, sample_rate)
+        frame_len = max(1, int(self.frame_duration * sample_rate))
+        max_frames = max(2, self._frames(max_duration))
+        total_samples = len(audio_data)
+
+        for segment_start, segment_end in self.speech_segments(energies_db):
+            start = segment_start
+            while segment_end - start > max_frames:
+                search_from = start + max_frames // 2
+                search_to = start + max_frames
+                cut = search_from + int(np.argmin(energies_db[search_from:search_to]))
+                yield start * frame_len, cut * frame_len
+                start = cut
+            yield start * frame_len, min(segment_end * frame_len, total_samples)
@@ -0,0 +1,70 @@
+"""Word error rate and reference transcripts for accuracy evaluation."""
+
+import json
+import re
+from pathlib import Path
+
+_WORD = re.compile(r"[\w']+")
+
+
+def normalize_words(text: str) -> list[str]:
+    """Lowercase and split into words, ignoring punctuation."""
+    return _WORD.findall(text.lower())
+
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    """
+    Compute the word error rate of a transcription.
+
+    Args:
+        reference: Ground-truth transcript
+        hypothesis: Transcription to score
+
+    Returns:
+        (substitutions + deletions + insertions) / reference words
+    """
+    ref = normalize_words(reference)
+    hyp = normalize_words(hypothesis)
+    if not ref:
+        return float(len(hyp) > 0)
+
+    # Levenshtein distance over words, keeping only the previous row
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, start=1):
+        current = [i]
+        for j, hyp_word in enumerate(hyp, start=1):
+            current.append(
+                min(
+                    previous[j] + 1,  # deletion
+                    current[j - 1] + 1,  # insertion
+                    previous[j - 1] + (ref_word != hyp_word),  # substitution
+                )
+            )
+        previous = current
+
+    return previous[-1] / len(ref)
+
+
+def load_references(path: str | Path) -> list[tuple[Path, str]]:
+    """
+    Load a reference set from a JSONL file.
+
+    Each line holds {"audio": <path>, "reference": <transcript>}. Relative
+    audio paths are resolved against the JSONL file's directory.
+
+    Args:
+        path: JSONL file with one audio file and transcript per line
+
+    Returns:
+        List of (audio_path, reference_transcript)
+    """
+    path = Path(path)
+    references = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            references.append((path.parent / entry["audio"], entry["reference"]))
+
+    return references